@@ -0,0 +1,215 @@
+import io
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from fetch_data_from_db import RecordQuery
+from task_4 import normalize_many
+from task_10 import DATABASE_PROFILES, DatabaseSaver, News, TextStatistics
+
+# Modules that `import task_10` must leave to the code that uses them
+LAZY_MODULES = ('argparse', 'asyncio', 'concurrent.futures', 'csv', 'hashlib', 'json', 'sqlite3',
+                'xml.etree.ElementTree')
+STARTUP_BUDGET_MS = 50  # Slowest accepted cumulative import time of task_10
+SAMPLE_TEXT = "Why corPorAte AmeRIca is abanDOning remoTe work. Selling My cAr, 2026! "
+
+
+def benchmark_insert_throughput(total_rows=1_000_000, step=100_000, batch_size=10_000):
+    """Insert News rows into an empty database and print throughput as the table grows."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_saver = DatabaseSaver(os.path.join(tmp_dir, 'benchmark.db'), batch_size=batch_size)
+        print(f"{'Rows in table':>15} {'Rows/sec':>12}")
+        for start in range(0, total_rows, step):
+            records = (News(f"Benchmark news number {number}", "Minsk") for number in range(start, start + step))
+            started = time.perf_counter()
+            with redirect_stdout(io.StringIO()):  # Hide the per-batch messages
+                db_saver.save_many(records)
+            elapsed = time.perf_counter() - started
+            print(f"{start + step:>15,} {step / elapsed:>12,.0f}")
+        db_saver.close()
+
+
+def benchmark_database_profiles(batched_rows=200_000, single_rows=2_000):
+    """Print inserts per second of each database profile, for batched and for one-per-commit inserts."""
+    print(f"{'Profile':<12} {'Batched rows/sec':>18} {'Single rows/sec':>18}")
+    for profile in DATABASE_PROFILES:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_saver = DatabaseSaver(os.path.join(tmp_dir, 'benchmark.db'), batch_size=10_000, profile=profile)
+            with redirect_stdout(io.StringIO()):  # Hide the per-record and per-batch messages
+                started = time.perf_counter()
+                db_saver.save_many(News(f"Batched news number {number}", "Minsk") for number in range(batched_rows))
+                batched_time = time.perf_counter() - started
+
+                started = time.perf_counter()
+                for number in range(single_rows):
+                    db_saver.save_news(f"Single news number {number}", "Minsk", "2026-10-18 12:00:00")
+                single_time = time.perf_counter() - started
+            db_saver.close()
+        print(f"{profile:<12} {batched_rows / batched_time:>18,.0f} {single_rows / single_time:>18,.0f}")
+
+
+def benchmark_search(row_count=1_000_000, searches=20):
+    """Compare RecordQuery.search with a LIKE scan of the News table over row_count rows."""
+    words = [''.join(random.choices(string.ascii_lowercase, k=6)) for _ in range(5_000)]
+    keywords = [words[0], words[1]]  # Each word is in about 0.1% of the rows
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_name = os.path.join(tmp_dir, 'benchmark.db')
+        db_saver = DatabaseSaver(db_name, batch_size=10_000, profile='bulk-load')
+        with redirect_stdout(io.StringIO()):  # Hide the per-batch messages
+            db_saver.save_many(News(f"{' '.join(random.sample(words, 5))} report {number}", "Minsk")
+                               for number in range(row_count))
+        db_saver.close()
+
+        query = RecordQuery(db_name)
+        started = time.perf_counter()
+        for _ in range(searches):
+            query.search(' '.join(keywords), ['News'])
+        search_time = (time.perf_counter() - started) / searches
+
+        started = time.perf_counter()
+        for _ in range(searches):
+            query.connection.execute("SELECT id, text FROM News WHERE text LIKE ? AND text LIKE ? LIMIT 20",
+                                     [f'%{keyword}%' for keyword in keywords]).fetchall()
+        like_time = (time.perf_counter() - started) / searches
+        query.close()
+    print(f"LIKE scan:   {like_time * 1000:8.2f} ms")
+    print(f"FTS5 search: {search_time * 1000:8.2f} ms (ranked, with snippets)")
+
+
+def count_letters_loop(text):
+    """Letter counting loop used before TextStatistics.add_letters, kept as the baseline."""
+    letter_count = {letter: 0 for letter in string.ascii_lowercase}
+    uppercase_count = {letter: 0 for letter in string.ascii_uppercase}
+    for char in text:
+        if char.isalpha():
+            lowercase_char = char.lower()
+            if lowercase_char in letter_count:
+                letter_count[lowercase_char] += 1
+                if char.isupper():
+                    uppercase_count[char] += 1
+    return letter_count, uppercase_count
+
+
+def benchmark_letter_count(size_mb=100):
+    """Compare the per-character letter loop with TextStatistics.add_letters on a size_mb corpus."""
+    corpus = SAMPLE_TEXT * (size_mb * 1024 * 1024 // len(SAMPLE_TEXT))
+
+    started = time.perf_counter()
+    letter_count, uppercase_count = count_letters_loop(corpus)
+    loop_time = time.perf_counter() - started
+
+    statistics = TextStatistics()
+    started = time.perf_counter()
+    statistics.add_letters(corpus)
+    fast_time = time.perf_counter() - started
+
+    assert (statistics.letter_count, statistics.uppercase_count) == (letter_count, uppercase_count)
+    print(f"Python loop:  {loop_time:8.2f} s")
+    print(f"add_letters:  {fast_time:8.2f} s ({loop_time / fast_time:.0f}x faster)")
+
+
+def text_normalize_chained(text):
+    """Copy-per-step normalization used before the current task_4.text_normalize, kept as the baseline."""
+    text_normal = text.replace('\n', ' ').replace('“', ' “')
+    text_normal = ' '.join(text_normal.split()).lower()
+    sentences = [sentence.strip().capitalize() for sentence in text_normal.split('. ')]
+    return '. '.join(sentences)
+
+
+def benchmark_normalize(count=1_000_000):
+    """Compare chained and current text normalization on count short strings."""
+    samples = ['New  York', 'minsk', 'This iz a TEST. another one.', 'Selling my  cAr', 'lINDA', 'fix“iZ” here']
+    texts = [f"{random.choice(samples)} {number % 100}" for number in range(count)]
+
+    started = time.perf_counter()
+    expected = [text_normalize_chained(text) for text in texts]
+    chained_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = normalize_many(texts)
+    fast_time = time.perf_counter() - started
+
+    assert result == expected
+    print(f"Chained steps:   {chained_time:8.2f} s")
+    print(f"normalize_many:  {fast_time:8.2f} s ({chained_time / fast_time:.1f}x faster)")
+
+
+class DictNews:
+    """News record with a per-instance __dict__ and an eagerly formatted date, kept as the baseline."""
+    def __init__(self, text, city):
+        self.text = text
+        self.date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.city = city
+
+
+def measure_record_bytes(record_class, texts):
+    """Return the average number of bytes allocated per record, excluding the shared texts."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [record_class(text, "Minsk") for text in texts]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / len(records)
+
+
+def benchmark_record_memory(count=100_000):
+    """Compare bytes per News record for the __dict__ baseline and the slotted record."""
+    texts = [f"Benchmark news number {number}" for number in range(count)]
+    dict_bytes = measure_record_bytes(DictNews, texts)
+    slots_bytes = measure_record_bytes(News, texts)
+    print(f"__dict__ record:  {dict_bytes:8.0f} bytes")
+    print(f"__slots__ record: {slots_bytes:8.0f} bytes ({dict_bytes / slots_bytes:.1f}x smaller)")
+
+
+def measure_import_time(module):
+    """Import module in a new interpreter with -X importtime; return its cumulative ms and the imported modules."""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # Measure with cached bytecode, like a deployed worker
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                            capture_output=True, text=True, check=True)
+    imported = {}
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix('import time:').split('|')
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            imported[fields[2].strip()] = int(fields[1]) / 1000
+    return imported[module], imported
+
+
+def benchmark_startup(module='task_10', runs=10):
+    """Check that importing module is fast and leaves the lazily imported modules alone."""
+    measure_import_time(module)  # Warm up: write the bytecode cache
+    times = []
+    for _ in range(runs):
+        import_ms, imported = measure_import_time(module)
+        times.append(import_ms)
+    loaded = [name for name in LAZY_MODULES if name in imported]
+    print(f"import {module}: best {min(times):.1f} ms, median {sorted(times)[runs // 2]:.1f} ms")
+    assert not loaded, f"Imported at startup: {', '.join(loaded)}"
+    assert min(times) <= STARTUP_BUDGET_MS, f"Import took {min(times):.1f} ms, budget is {STARTUP_BUDGET_MS} ms"
+
+
+# Available benchmarks by name
+BENCHMARKS = {
+    'inserts': benchmark_insert_throughput,
+    'profiles': benchmark_database_profiles,
+    'search': benchmark_search,
+    'letters': benchmark_letter_count,
+    'normalize': benchmark_normalize,
+    'memory': benchmark_record_memory,
+    'startup': benchmark_startup,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"\n== {name} ==")
+        BENCHMARKS[name]()
@@ -0,0 +1,203 @@
+import argparse
+import json
+import mmap
+import os
+import sys
+from array import array
+from datetime import date, datetime
+from functools import lru_cache
+
+from fetch_data_from_db import RecordQuery
+
+DEFAULT_OUTPUT_DIR = 'feed_columns'
+EXPORT_CHUNK_SIZE = 50_000  # Rows read from the database and written at a time
+EPOCH_DATE = date(1970, 1, 1)
+
+# Exported columns of each table with their types: int64/int32 are integers,
+# timestamp is UTC epoch seconds (int64), date is days since 1970-01-01 (int32)
+TABLE_COLUMNS = {
+    'News': [('id', 'int64'), ('text', 'string'), ('city', 'string'), ('date', 'timestamp')],
+    'PrivateAd': [('id', 'int64'), ('text', 'string'), ('expiration_date', 'date'),
+                  ('days_left', 'int32'), ('date', 'timestamp')],
+    'Comment': [('id', 'int64'), ('nickname', 'string'), ('text', 'string'),
+                ('date', 'timestamp'), ('words_count', 'int32')],
+}
+
+# Integer columns that DatabaseSaver keeps next to the text dates, read instead of parsing the text again
+SOURCE_COLUMNS = {'date': 'timestamp', 'expiration_date': 'expiration_timestamp'}
+
+# array typecodes of the fixed-width column types
+ARRAY_TYPECODES = {'int64': 'q', 'int32': 'i', 'timestamp': 'q', 'date': 'i'}
+# Stored in column files for dates that cannot be parsed; Parquet stores them as null
+MISSING_VALUES = {'timestamp': -2 ** 63, 'date': -2 ** 31}
+
+
+@lru_cache(maxsize=4096)
+def to_days(timestamp):
+    """Convert the epoch seconds of a local midnight to the number of days since 1970-01-01, or None.
+
+    Like the text dates, the timestamps are in the local time zone of the machine that saved them.
+    """
+    return (datetime.fromtimestamp(timestamp).date() - EPOCH_DATE).days if timestamp is not None else None
+
+
+@lru_cache(maxsize=None)
+def load_pyarrow():
+    """Import pyarrow on first use and return (pyarrow, pyarrow.parquet), or (None, None) when it is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:  # Parquet export is optional, the column files work without it
+        return None, None
+    return pyarrow, pyarrow.parquet
+
+
+# Converters from the SQLite value to the exported value, by column type
+CONVERTERS = {'date': to_days}
+
+
+def iter_column_chunks(connection, table, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield dicts of typed column lists, chunk_size rows at a time."""
+    columns = TABLE_COLUMNS[table]
+    cursor = connection.execute(f"SELECT {', '.join(SOURCE_COLUMNS.get(name, name) for name, _ in columns)} "
+                                f"FROM {table} ORDER BY id")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        chunk = {}
+        for index, (name, kind) in enumerate(columns):
+            values = [row[index] for row in rows]
+            if kind in CONVERTERS:
+                values = list(map(CONVERTERS[kind], values))
+            chunk[name] = values
+        yield chunk
+
+
+def write_parquet(connection, table, file_path):
+    """Write one table to a Parquet file with one row group per chunk."""
+    pa, pq = load_pyarrow()
+    # Epoch seconds are instants, so they are declared as UTC; readers convert them to their own time zone
+    arrow_types = {'int64': pa.int64(), 'int32': pa.int32(), 'string': pa.string(),
+                   'timestamp': pa.timestamp('s', tz='UTC'), 'date': pa.date32()}
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in TABLE_COLUMNS[table]])
+    row_count = 0
+    with pq.ParquetWriter(file_path, schema) as writer:
+        for chunk in iter_column_chunks(connection, table):
+            arrays = [pa.array(chunk[name], type=schema.field(name).type) for name in schema.names]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            row_count += len(arrays[0])
+    return row_count
+
+
+def write_column_files(connection, table, table_dir):
+    """Write one table as a folder of memory-mappable column files.
+
+    Fixed-width columns are raw arrays in <column>.bin; dates that could not be parsed
+    are stored as MISSING_VALUES. String columns keep their UTF-8 bytes in
+    <column>.bin and int64 end offsets in <column>.offsets. schema.json records
+    the row count, column types and byte order.
+    """
+    os.makedirs(table_dir, exist_ok=True)
+    columns = TABLE_COLUMNS[table]
+    files = {}
+    offsets = {}  # Current end offset of each string column
+    for name, kind in columns:
+        files[name] = open(os.path.join(table_dir, f'{name}.bin'), 'wb')
+        if kind == 'string':
+            files[f'{name}.offsets'] = open(os.path.join(table_dir, f'{name}.offsets'), 'wb')
+            offsets[name] = 0
+
+    row_count = 0
+    try:
+        for chunk in iter_column_chunks(connection, table):
+            for name, kind in columns:
+                if kind == 'string':
+                    encoded = [value.encode('utf-8') for value in chunk[name]]
+                    ends = array('q')
+                    for value in encoded:
+                        offsets[name] += len(value)
+                        ends.append(offsets[name])
+                    files[name].write(b''.join(encoded))
+                    ends.tofile(files[f'{name}.offsets'])
+                else:
+                    missing = MISSING_VALUES.get(kind)
+                    values = [missing if value is None else value for value in chunk[name]]
+                    array(ARRAY_TYPECODES[kind], values).tofile(files[name])
+            row_count += len(chunk['id'])
+    finally:
+        for file in files.values():
+            file.close()
+
+    with open(os.path.join(table_dir, 'schema.json'), 'w') as file:
+        json.dump({'rows': row_count, 'byteorder': sys.byteorder, 'columns': dict(columns)}, file, indent=4)
+    return row_count
+
+
+def export_columnar(db_name='records.db', output_dir=DEFAULT_OUTPUT_DIR, file_format=None):
+    """Export the News, PrivateAd and Comment tables to columnar files and return the row counts.
+
+    file_format is 'parquet' or 'columns'; by default Parquet is used when pyarrow is installed.
+    """
+    pa = load_pyarrow()[0]
+    if file_format is None:
+        file_format = 'parquet' if pa is not None else 'columns'
+    if file_format == 'parquet' and pa is None:
+        raise RuntimeError("Parquet export needs pyarrow; use the 'columns' format instead.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    row_counts = {}
+    with RecordQuery(db_name) as query:  # Migrates databases written before the timestamp columns existed
+        connection = query.connection
+        for table in TABLE_COLUMNS:
+            if file_format == 'parquet':
+                row_counts[table] = write_parquet(connection, table, os.path.join(output_dir, f'{table}.parquet'))
+            else:
+                row_counts[table] = write_column_files(connection, table, os.path.join(output_dir, table))
+            print(f"Exported {row_counts[table]} {table} rows.")
+    return row_counts
+
+
+def read_column(table_dir, column):
+    """Read one column written by write_column_files, memory-mapping only that column's files."""
+    with open(os.path.join(table_dir, 'schema.json')) as file:
+        schema = json.load(file)
+    kind = schema['columns'][column]
+    data_path = os.path.join(table_dir, f'{column}.bin')
+    if schema['rows'] == 0 or os.path.getsize(data_path) == 0:  # mmap cannot map an empty file
+        return column_values(b'', kind, table_dir, column, schema['byteorder'])
+
+    with open(data_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return column_values(data, kind, table_dir, column, schema['byteorder'])
+
+
+def column_values(data, kind, table_dir, column, byteorder):
+    """Decode the bytes of one column file into an array, or a list of strings."""
+    if kind != 'string':
+        values = array(ARRAY_TYPECODES[kind])
+        values.frombytes(data)
+        if byteorder != sys.byteorder:
+            values.byteswap()
+        return values
+
+    ends = array('q')
+    with open(os.path.join(table_dir, f'{column}.offsets'), 'rb') as file:
+        ends.frombytes(file.read())
+    if byteorder != sys.byteorder:
+        ends.byteswap()
+    values = []
+    start = 0
+    for end in ends:
+        values.append(data[start:end].decode('utf-8'))
+        start = end
+    return values
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export records.db tables to columnar files.")
+    parser.add_argument('db', nargs='?', default='records.db', help="database file (default: records.db)")
+    parser.add_argument('output_dir', nargs='?', default=DEFAULT_OUTPUT_DIR, help="output folder")
+    parser.add_argument('--format', choices=['parquet', 'columns'], default=None,
+                        help="file format (default: parquet when pyarrow is installed)")
+    args = parser.parse_args()
+    export_columnar(args.db, args.output_dir, args.format)
@@ -0,0 +1,254 @@
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+
+from task_10 import FILE_NAME, Comment, News, PrivateAd, date_timestamp
+
+INDEX_SUFFIX = '.idx'
+# Index file layout: a header with the number of feed bytes indexed so far and the feed fingerprint,
+# then one fixed-size entry per record: byte offset, creation timestamp, block length, type code
+INDEX_HEADER = struct.Struct('<q16s')
+FINGERPRINT_SIZE = 4096  # Indexed bytes at the start of the feed that identify it
+INDEX_ENTRY = struct.Struct('<qqiB')
+RECORD_SEPARATOR = b'\n\n'  # Every record written by Record.format ends with a blank line
+# First two lines of a record; older feeds have records without the blank line between them
+RECORD_HEADER = re.compile(rb'^(?:News|Private Ad|Nickname:[^\n]*)\nDate:', re.MULTILINE)
+
+# Type codes stored in the index
+TYPE_CODES = {News: 1, PrivateAd: 2, Comment: 3}
+RECORD_TYPES = {code: record_class for record_class, code in TYPE_CODES.items()}
+
+
+def field_value(line):
+    """Return the text after the 'Name:' label of a feed line."""
+    return line.split(':', 1)[1].strip()
+
+
+def block_type_and_date(lines):
+    """Return the record class and the 'YYYY-MM-DD HH:MM:SS' date of a feed block, or (None, None)."""
+    if lines[0] == 'News' and len(lines) > 3:
+        return News, field_value(lines[1])
+    if lines[0] == 'Private Ad' and len(lines) > 2:
+        return PrivateAd, field_value(lines[1].split('|', 1)[0])  # Both the '|' and ' | ' formats
+    if lines[0].startswith('Nickname:') and len(lines) > 3:
+        return Comment, field_value(lines[1])
+    return None, None
+
+
+def split_records(block, offset):
+    """Return the (offset, length) of each record in a feed block that starts at byte `offset`.
+
+    A block normally holds one record, but one that is not followed by a blank line
+    runs into the next record, so a new record also starts at every record header.
+    """
+    starts = [match.start() for match in RECORD_HEADER.finditer(block) if match.start() > 0]
+    records = []
+    for start, end in zip([0] + starts, starts + [len(block)]):
+        length = len(block[start:end].rstrip(b'\n'))
+        if length:
+            records.append((offset + start, length))
+    return records
+
+
+def parse_block(block):
+    """Turn the text of one feed block back into a typed record with its original date and counts."""
+    lines = block.split('\n')
+    record_class, date = block_type_and_date(lines)
+    if record_class is News:
+        record = News('\n'.join(lines[3:]), field_value(lines[2]))
+    elif record_class is PrivateAd:
+        # Older lines: 'Date: D|E|N days left', current lines: 'Date: D | Expiration: E | N days left'
+        parts = [part.strip() for part in lines[1].split('|')]
+        expiration = parts[1].split(':', 1)[1].strip() if ':' in parts[1] else parts[1]
+        record = PrivateAd('\n'.join(lines[2:]), expiration)
+        record.days_left = int(parts[2].split()[0])  # Days left when the ad was published
+    elif record_class is Comment:
+        record = Comment(field_value(lines[0]), '\n'.join(lines[2:-1]))
+        record.words_num = int(field_value(lines[-1]))
+    else:
+        raise ValueError(f"Unknown feed record: {lines[0]}")
+    record.timestamp = date_timestamp(date)
+    return record
+
+
+def feed_fingerprint(data):
+    """Return a short hash of the first bytes of the feed."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class FeedIndex:
+    """Sidecar offset index of the news feed for record lookups and date-range scans.
+
+    The feed is read through mmap. update() only scans the bytes appended since the
+    last indexed record, and rebuilds the index when the feed was truncated or replaced:
+    the index stores a hash of the first indexed bytes, which appending never changes.
+    """
+
+    def __init__(self, feed_path=FILE_NAME, index_path=None):
+        self.feed_path = feed_path
+        self.index_path = index_path or feed_path + INDEX_SUFFIX
+        self.indexed_size = 0  # Feed bytes covered by the index
+        self.fingerprint = feed_fingerprint(b'')
+        self.offsets = array('q')
+        self.timestamps = array('q')
+        self.lengths = array('i')
+        self.types = array('B')
+        self.sorted = True  # Whether the timestamps are in order, so date ranges can be found by bisection
+        self.feed_map = None
+        self._load()
+        self.update()
+
+    def _load(self):
+        """Read the index file, dropping entries written after its header was last updated."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'rb') as file:
+            data = file.read()
+        if len(data) < INDEX_HEADER.size:
+            return
+        self.indexed_size, self.fingerprint = INDEX_HEADER.unpack_from(data)
+        entries_size = (len(data) - INDEX_HEADER.size) // INDEX_ENTRY.size * INDEX_ENTRY.size
+        for offset, timestamp, length, type_code in INDEX_ENTRY.iter_unpack(
+                data[INDEX_HEADER.size:INDEX_HEADER.size + entries_size]):
+            if offset >= self.indexed_size:
+                break  # Interrupted update: the header does not cover this entry yet
+            self._append(offset, timestamp, length, type_code)
+
+    def _append(self, offset, timestamp, length, type_code):
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            self.sorted = False  # E.g. the clock was set back between two sessions
+        self.offsets.append(offset)
+        self.timestamps.append(timestamp)
+        self.lengths.append(length)
+        self.types.append(type_code)
+
+    def _reset(self):
+        self.indexed_size = 0
+        self.fingerprint = feed_fingerprint(b'')
+        self.sorted = True
+        for column in (self.offsets, self.timestamps, self.lengths, self.types):
+            del column[:]
+
+    def _map_feed(self):
+        """Map the current feed file, or unmap it when the feed is missing or empty."""
+        if self.feed_map is not None:
+            self.feed_map.close()
+            self.feed_map = None
+        if os.path.exists(self.feed_path) and os.path.getsize(self.feed_path):
+            with open(self.feed_path, 'rb') as file:
+                self.feed_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def update(self):
+        """Index the records appended to the feed since the last update and return their number."""
+        self._map_feed()
+        feed_size = len(self.feed_map) if self.feed_map is not None else 0
+        rebuilt = feed_size < self.indexed_size or self._current_fingerprint() != self.fingerprint
+        if rebuilt:
+            print(f"File '{self.feed_path}' was truncated or replaced, rebuilding the index.")
+            self._reset()
+        first_new = len(self.offsets)
+
+        position = self.indexed_size
+        while position < feed_size:
+            while position < feed_size and self.feed_map[position] == 10:  # Skip extra empty lines
+                position += 1
+            end = self.feed_map.find(RECORD_SEPARATOR, position)
+            if end == -1:
+                break  # The last record is not completely written yet
+            for offset, length in split_records(self.feed_map[position:end], position):
+                lines = self.feed_map[offset:offset + length].decode('utf-8').split('\n')
+                record_class, date = block_type_and_date(lines)
+                timestamp = date_timestamp(date) if record_class is not None else None
+                if timestamp is not None:  # Blocks that are not records, or have no valid date, are not indexed
+                    self._append(offset, timestamp, length, TYPE_CODES[record_class])
+            position = end + len(RECORD_SEPARATOR)
+            self.indexed_size = position
+        self.fingerprint = self._current_fingerprint()
+
+        if len(self.offsets) != first_new or rebuilt or not os.path.exists(self.index_path):
+            self._save(first_new)
+        return len(self.offsets) - first_new
+
+    def _current_fingerprint(self):
+        """Return the fingerprint of the part of the feed that the index covers."""
+        if self.feed_map is None:
+            return feed_fingerprint(b'')
+        return feed_fingerprint(self.feed_map[:min(self.indexed_size, FINGERPRINT_SIZE)])
+
+    def _save(self, first_new):
+        """Append the new entries to the index file, then record how far the feed is indexed."""
+        rewrite = first_new == 0 or not os.path.exists(self.index_path)
+        with open(self.index_path, 'wb' if rewrite else 'r+b') as file:
+            if rewrite:
+                file.write(INDEX_HEADER.pack(0, self.fingerprint))
+            file.seek(INDEX_HEADER.size + first_new * INDEX_ENTRY.size)
+            file.truncate()
+            file.write(b''.join(INDEX_ENTRY.pack(self.offsets[number], self.timestamps[number],
+                                                 self.lengths[number], self.types[number])
+                                for number in range(first_new, len(self.offsets))))
+            file.flush()
+            file.seek(0)
+            file.write(INDEX_HEADER.pack(self.indexed_size, self.fingerprint))  # Written last, so a partial update is ignored
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def get(self, number):
+        """Return record number `number` (starting at 0) of the feed as a typed record."""
+        offset = self.offsets[number]
+        return parse_block(self.feed_map[offset:offset + self.lengths[number]].decode('utf-8'))
+
+    def numbers_between(self, start=None, end=None):
+        """Return the range of record numbers created between the start and end datetimes, both included."""
+        low = int(start.timestamp()) if start is not None else None
+        high = int(end.timestamp()) if end is not None else None
+        if self.sorted:
+            # Records are appended in creation order, so the range can be found by bisection
+            first = bisect_left(self.timestamps, low) if low is not None else 0
+            last = bisect_right(self.timestamps, high) if high is not None else len(self.timestamps)
+            return range(first, last)
+        return [number for number, timestamp in enumerate(self.timestamps)
+                if (low is None or timestamp >= low) and (high is None or timestamp <= high)]
+
+    def scan(self, start=None, end=None, record_type=None):
+        """Yield the records created between start and end, optionally only of one record class."""
+        type_code = TYPE_CODES[record_type] if record_type is not None else None
+        for number in self.numbers_between(start, end):
+            if type_code is None or self.types[number] == type_code:
+                yield self.get(number)
+
+    def close(self):
+        if self.feed_map is not None:
+            self.feed_map.close()
+            self.feed_map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+if __name__ == "__main__":
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description="Index the news feed and print records from it.")
+    parser.add_argument('--feed', default=FILE_NAME, help=f"news feed file (default: {FILE_NAME})")
+    parser.add_argument('--number', type=int, help="print only this record number")
+    parser.add_argument('--from', dest='start', type=datetime.fromisoformat, help="first date, YYYY-MM-DD[ HH:MM:SS]")
+    parser.add_argument('--to', dest='end', type=datetime.fromisoformat, help="last date, YYYY-MM-DD[ HH:MM:SS]")
+    parser.add_argument('--type', choices=['News', 'PrivateAd', 'Comment'], help="print only this record type")
+    args = parser.parse_args()
+
+    with FeedIndex(args.feed) as index:
+        if args.number is not None:
+            print(index.get(args.number).format(), end='')
+        else:
+            record_type = {record_class.__name__: record_class for record_class in TYPE_CODES}.get(args.type)
+            for record in index.scan(args.start, args.end, record_type):
+                print(record.format(), end='')
@@ -1,23 +1,223 @@
+import argparse
 import sqlite3
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
 
-def fetch_data_from_db(db_name):
+from task_10 import DatabaseSaver
+
+PAGE_SIZE = 1000  # Rows fetched from the database at a time
+SEARCH_LIMIT = 20  # Search results returned by default
+SNIPPET_TOKENS = 12  # Words around the matches shown in a search snippet
+
+# Columns returned for each record table
+TABLE_COLUMNS = {
+    'News': ('id', 'text', 'city', 'date'),
+    'PrivateAd': ('id', 'text', 'expiration_date', 'days_left', 'date'),
+    'Comment': ('id', 'nickname', 'text', 'date', 'words_count'),
+}
+
+# Row types, e.g. NewsRow(id, text, city, date)
+ROW_TYPES = {table: namedtuple(f'{table}Row', columns) for table, columns in TABLE_COLUMNS.items()}
+# A search hit: the matching row, its text with the matches in [brackets], and its bm25 rank (lower is better)
+SearchResult = namedtuple('SearchResult', ('record', 'snippet', 'rank'))
+
+
+def match_query(text):
+    """Turn plain keywords into an FTS5 query that matches records containing all of them."""
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def date_bound(value, end=False):
+    """Return a datetime, date or 'YYYY-MM-DD[ HH:MM:SS]' string as the epoch seconds stored in timestamp columns.
+
+    A date without a time means the whole day: its first second, or its last one for an end bound.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value) if len(value) > 10 else date.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.max if end else time.min)
+    return int(value.timestamp())
+
+
+def date_argument(value):
+    """Check a --from or --to value on the command line and keep it as given."""
     try:
-        connection = sqlite3.connect(db_name)
-        cursor = connection.cursor()
+        date_bound(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', use YYYY-MM-DD[ HH:MM:SS]")
+    return value
+
+
+class RecordQuery:
+    """Streams rows of the record tables page by page, so large tables are read in constant memory.
+
+    Pages are read with keyset paging (WHERE id > last id seen), which stays fast
+    on any page, unlike OFFSET. Date filters use the indexed timestamp columns
+    that DatabaseSaver adds to the tables; a database written before they existed
+    is migrated when it is opened.
+    """
+
+    def __init__(self, db_name='records.db', page_size=PAGE_SIZE):
+        self.db_name = db_name
+        self.page_size = page_size
+        self.connection = sqlite3.connect(db_name)
+        if self._needs_migration():
+            print(f"Updating database '{db_name}' to the current format.")
+            DatabaseSaver(db_name).close()
+
+    def _needs_migration(self):
+        """Return True when a record table is missing, or has no timestamp columns or search table yet."""
+        tables = {row[0] for row in self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table, timestamp_columns in DatabaseSaver.TIMESTAMP_COLUMNS.items():
+            if table not in tables or f"{table}Search" not in tables:
+                return True
+            columns = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+            if not columns.issuperset(timestamp_columns):
+                return True
+        return False
+
+    def rows(self, table, city=None, date_from=None, date_to=None):
+        """Yield the rows of one table as namedtuples.
+
+        city only applies to News. date_from and date_to are datetimes, dates or
+        'YYYY-MM-DD[ HH:MM:SS]' strings and are both included. Without a date
+        filter rows come in id order, with one in date order.
+        """
+        if table not in TABLE_COLUMNS:
+            raise ValueError(f"Unknown record type '{table}'. Use one of: {', '.join(TABLE_COLUMNS)}.")
+        conditions = []
+        params = []
+        if city is not None:
+            conditions.append("city = ?")
+            params.append(city)
+        if date_from is None and date_to is None:
+            yield from self._pages(table, conditions, params)
+        else:
+            yield from self._range_pages(table, 'timestamp', date_from, date_to, conditions, params)
 
-        cursor.execute("SELECT * FROM News;")
+    def _pages(self, table, conditions, params):
+        """Yield the rows matching the conditions in id order, one page at a time."""
+        sql = (f"SELECT {', '.join(TABLE_COLUMNS[table])} FROM {table} "
+               f"WHERE {' AND '.join(['id > ?'] + conditions)} ORDER BY id LIMIT ?")
+        row_type = ROW_TYPES[table]
 
-        records = cursor.fetchall()
+        last_id = 0
+        while True:
+            page = self.connection.execute(sql, [last_id] + params + [self.page_size]).fetchall()
+            if not page:
+                break
+            for row in page:
+                yield row_type._make(row)
+            last_id = page[-1][0]
 
-        for record in records:
-            print(record)
+    def _range_pages(self, table, column, start, end, conditions, params):
+        """Yield the rows whose timestamp column is between start and end, in (column, id) order.
 
+        Records of one batch share a timestamp, so each page first continues after the last
+        id seen within the last timestamp, then seeks past that timestamp. Both steps are
+        index seeks, so every page costs the same however many rows share a timestamp.
+        """
+        low = date_bound(start) if start is not None else -2 ** 62  # Far outside any record date
+        high = date_bound(end, end=True) if end is not None else 2 ** 62
+        select = f"SELECT {', '.join(TABLE_COLUMNS[table])}, {column} FROM {table} WHERE "
+        same_sql = (select + ' AND '.join([f'{column} = ?', 'id > ?'] + conditions) + " ORDER BY id LIMIT ?")
+        after_sql = (select + ' AND '.join([f'{column} > ?', f'{column} <= ?'] + conditions)
+                     + f" ORDER BY {column}, id LIMIT ?")
+        row_type = ROW_TYPES[table]
+
+        page = self.connection.execute(after_sql, [low - 1, high] + params + [self.page_size]).fetchall()
+        while page:
+            for row in page:
+                yield row_type._make(row[:-1])
+            last_value, last_id = page[-1][-1], page[-1][0]
+            page = self.connection.execute(same_sql, [last_value, last_id] + params + [self.page_size]).fetchall()
+            if len(page) < self.page_size:
+                page += self.connection.execute(
+                    after_sql, [last_value, high] + params + [self.page_size - len(page)]).fetchall()
+
+    def records(self, record_types=None, city=None, date_from=None, date_to=None):
+        """Yield the rows of several tables, one table after another.
+
+        record_types is a list of table names and defaults to all of them. With a city
+        filter only News rows are returned, because the other tables have no city.
+        """
+        for table in record_types or TABLE_COLUMNS:
+            if city is not None and 'city' not in TABLE_COLUMNS[table]:
+                continue
+            yield from self.rows(table, city, date_from, date_to)
+
+    def recent(self, days, record_types=None):
+        """Yield the records created in the last `days` days, oldest first within each table."""
+        return self.records(record_types, date_from=datetime.now() - timedelta(days=days))
+
+    def expiring(self, days, start=None):
+        """Yield the Private Ads that expire within `days` days of start (default today), soonest first."""
+        start = start or date.today()
+        return self._range_pages('PrivateAd', 'expiration_timestamp', start, start + timedelta(days=days), [], [])
+
+    def search(self, text, record_types=None, limit=SEARCH_LIMIT, raw=False):
+        """Return the best matching records for keywords, ranked by bm25 across the record tables.
+
+        The <table>Search tables are created by DatabaseSaver. With raw=True, text is
+        passed to FTS5 as is, so phrases, prefixes (remot*), OR and NOT can be used.
+        """
+        query = text if raw else match_query(text)
+        if not query:
+            return []
+        results = []
+        for table in record_types or TABLE_COLUMNS:
+            search_table = f"{table}Search"
+            columns = ', '.join(f"{table}.{column}" for column in TABLE_COLUMNS[table])
+            text_column = DatabaseSaver.SEARCH_COLUMNS[table].index('text')
+            sql = (f"SELECT {columns}, snippet({search_table}, {text_column}, '[', ']', '...', {SNIPPET_TOKENS}), "
+                   f"bm25({search_table}) FROM {search_table} JOIN {table} ON {table}.id = {search_table}.rowid "
+                   f"WHERE {search_table} MATCH ? ORDER BY rank LIMIT ?")
+            for row in self.connection.execute(sql, (query, limit)):
+                results.append(SearchResult(ROW_TYPES[table]._make(row[:-2]), row[-2], row[-1]))
+        results.sort(key=lambda result: result.rank)
+        return results[:limit]
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def fetch_data_from_db(db_name, record_types=('News',), city=None, date_from=None, date_to=None):
+    """Print the rows of the record tables, reading them page by page."""
+    try:
+        with RecordQuery(db_name) as query:
+            for record in query.records(record_types, city, date_from, date_to):
+                print(record)
     except sqlite3.Error as e:
         print(f"Error connecting to database: {e}")
-    finally:
 
-        if connection:
-            connection.close()
+
+def search_db(db_name, text, record_types=None):
+    """Print the best matching records for keywords with their snippets."""
+    try:
+        with RecordQuery(db_name) as query:
+            for result in query.search(text, record_types):
+                print(f"{type(result.record).__name__[:-3]} {result.record.id}: {result.snippet}")
+    except sqlite3.Error as e:
+        print(f"Error searching database: {e}")
 
 
-fetch_data_from_db('records.db')
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print or search records saved in the database.")
+    parser.add_argument('db', nargs='?', default='records.db', help="database file (default: records.db)")
+    parser.add_argument('--type', action='append', choices=list(TABLE_COLUMNS), help="record type, may be repeated")
+    parser.add_argument('--city', help="only News from this city")
+    parser.add_argument('--from', dest='date_from', type=date_argument, help="first date, YYYY-MM-DD[ HH:MM:SS]")
+    parser.add_argument('--to', dest='date_to', type=date_argument, help="last date, included, YYYY-MM-DD[ HH:MM:SS]")
+    parser.add_argument('--search', help="keywords to search for instead of listing records")
+    args = parser.parse_args()
+    if args.search:
+        search_db(args.db, args.search, args.type)
+    else:
+        fetch_data_from_db(args.db, args.type or list(TABLE_COLUMNS), args.city, args.date_from, args.date_to)
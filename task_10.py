@@ -1,98 +1,368 @@
 import os
+import sys
+import importlib
 from datetime import datetime
-import re
 from task_4 import fix_misspelling
 from task_4 import text_normalize
-import csv
+from task_4 import normalize_field
+from tokenizer import count_words, iter_words
 import string
-import json
-import xml.etree.ElementTree as ET
-import sqlite3
+import time
+import atexit
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from functools import lru_cache
+import threading
+
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access.
+
+    Keeps `import task_10` fast for short-lived workers that never touch
+    the database, the json/xml readers, the CSVs or the async service.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attribute):
+        value = getattr(importlib.import_module(self._name), attribute)
+        setattr(self, attribute, value)  # Later lookups skip __getattr__
+        return value
+
+
+# Modules that are slow to import and only needed by some commands
+argparse = LazyModule('argparse')
+asyncio = LazyModule('asyncio')
+concurrent_futures = LazyModule('concurrent.futures')
+csv = LazyModule('csv')
+ET = LazyModule('xml.etree.ElementTree')
+glob = LazyModule('glob')
+hashlib = LazyModule('hashlib')
+json = LazyModule('json')
+sqlite3 = LazyModule('sqlite3')
 
 # File to store the records
 FILE_NAME = 'news_feed.txt'
 DEFAULT_INPUT_FILE = 'input_records.txt'
 DEFAULT_INPUT_JSON = 'input_json.json'
 DEFAULT_INPUT_XML = 'XML_news.xml'
+STATISTICS_DB = 'statistics.db'  # Word and letter totals of all sessions
+WORD_COUNT_CSV = 'word_count.csv'
+LETTER_COUNT_CSV = 'letter_count.csv'
+RECORD_BUFFER_SIZE = 64 * 1024  # Number of characters read at a time from the text feed
+DEFAULT_BATCH_SIZE = 500  # Number of records written to the database in one transaction
+FEED_BUFFER_SIZE = 64 * 1024  # Size of the write buffer for the news feed file
+QUEUE_SIZE = 64  # Chunks of records the service queue holds before readers have to wait
+QUEUE_CHUNK_SIZE = 100  # Records passed through the service queue at a time
+WATCH_INTERVAL = 1.0  # Seconds between scans of a watched folder
+DATE_CACHE_SIZE = 1024  # Distinct dates kept parsed or formatted by the date helpers
+
+# SQLite pragmas applied by DatabaseSaver, by profile name
+DATABASE_PROFILES = {
+    # SQLite defaults: rollback journal and a sync on every commit, so a saved record survives a power loss
+    'durable': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+    },
+    # Write-ahead log with fewer syncs and more memory; a power loss may undo the last commits, never corrupt
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64 * 1024,  # 64 MB page cache
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+DEFAULT_DATABASE_PROFILE = 'durable'
+
+
+class FeedWriter:
+    """Keeps the news feed file open and writes records through a buffer.
+
+    The buffer is flushed every flush_every records, every flush_interval_ms
+    milliseconds, or only on flush()/close() when both are None. A file_path
+    of None turns the feed off.
+    """
+
+    def __init__(self, file_path=FILE_NAME, flush_every=1, flush_interval_ms=None):
+        self.file_path = file_path
+        self.flush_every = flush_every
+        self.flush_interval_ms = flush_interval_ms
+        self.file = None  # Opened on the first write
+        self.pending = 0  # Records written since the last flush
+        self.last_flush = time.monotonic()
+
+    def write(self, record):
+        """Append one formatted record and flush if the flush policy says so."""
+        if self.file_path is None:
+            return
+        if self.file is None:
+            # Same bytes on every platform: feed_index.py reads the feed as UTF-8 split on '\n\n'
+            self.file = open(self.file_path, 'a', buffering=FEED_BUFFER_SIZE, encoding='utf-8', newline='\n')
+        self.file.write(record)
+        self.pending += 1
+        if self.flush_every and self.pending >= self.flush_every:
+            self.flush()
+        elif self.flush_interval_ms is not None and \
+                (time.monotonic() - self.last_flush) * 1000 >= self.flush_interval_ms:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records to the file."""
+        if self.file is not None:
+            self.file.flush()
+        self.pending = 0
+        self.last_flush = time.monotonic()
 
+    def close(self):
+        """Flush the buffer and close the file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.pending = 0
 
-class Record:
-    """Base class for all records."""
-    # Class-level variable to accumulate text from all records
-    accumulated_text = ""
+    def __enter__(self):
+        return self
 
-    def __init__(self, text):
-        self.text = text
-        self.date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # The current date and time when the record is created
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
 
-    def publish(self):
-        """Publishes the record and updates accumulated text."""
-        # Add the current record's text to the accumulated text
-        Record.accumulated_text += " " + self.text
 
-    @classmethod
-    def finalize_and_update_csvs(cls):
-        """Finalize the accumulated text and generate word and letter count CSVs."""
-        cls.generate_word_count_csv(cls.accumulated_text)
-        cls.generate_letter_count_csv(cls.accumulated_text)
+# Every byte except the ASCII letters, deleted from the text before letters are counted
+NON_LETTER_BYTES = bytes(sorted(set(range(256)) - set(string.ascii_letters.encode('ascii'))))
+# Each latin letter with its lowercase and uppercase byte, for counting with bytes.count
+LETTER_BYTES = [(letter, letter.encode('ascii'), letter.upper().encode('ascii'))
+                for letter in string.ascii_lowercase]
 
-    @staticmethod
-    def generate_word_count_csv(text, file_path='word_count.csv'):
-        """Generate CSV with word counts."""
 
-        words = text.lower().split()
-        word_count = {}
+class TextStatistics:
+    """Word and letter counters updated as each record is published."""
+
+    def __init__(self):
+        self.word_count = {}
+        self.letter_count = {letter: 0 for letter in string.ascii_lowercase}
+        self.uppercase_count = {letter: 0 for letter in string.ascii_uppercase}
+
+    def add(self, text):
+        """Add the words and letters of one text to the counters."""
+        for word in iter_words(text):
+            self.word_count[word] = self.word_count.get(word, 0) + 1
+
+        self.add_letters(text)
 
-        for word in words:
-            word = word.strip(string.punctuation)
-            if word:
-                word_count[word] = word_count.get(word, 0) + 1
+    def add_letters(self, text):
+        """Add the latin letters of a text to the counters, using C-speed passes instead of a Python loop per character."""
+        # Only latin letters have a row in the CSV, so everything else is dropped before counting
+        letters = text.encode('ascii', 'ignore').translate(None, NON_LETTER_BYTES)
+        for letter, lowercase_byte, uppercase_byte in LETTER_BYTES:
+            count_uppercase = letters.count(uppercase_byte)
+            self.letter_count[letter] += letters.count(lowercase_byte) + count_uppercase
+            self.uppercase_count[letter.upper()] += count_uppercase
 
+    def write_word_count_csv(self, file_path=WORD_COUNT_CSV):
+        """Write the word counts to a CSV file."""
         with open(file_path, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
             writer.writerow(['Word', 'Count'])
-            for word, count in word_count.items():
+            for word, count in self.word_count.items():
                 writer.writerow([word, count])
 
-    @staticmethod
-    def generate_letter_count_csv(text, file_path='letter_count.csv'):
-        """Generate CSV with letter counts, uppercase counts, and percentage of uppercase."""
-
-        letter_count = {letter: 0 for letter in string.ascii_lowercase}
-        uppercase_count = {letter: 0 for letter in string.ascii_uppercase}
-
-        total_letters = 0
-        for char in text:
-            if char.isalpha():
-                total_letters += 1
-                lowercase_char = char.lower()
-                letter_count[lowercase_char] += 1
-                if char.isupper():
-                    uppercase_count[char] += 1
-
+    def write_letter_count_csv(self, file_path=LETTER_COUNT_CSV):
+        """Write letter counts, uppercase counts, and percentage of uppercase to a CSV file."""
         with open(file_path, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
             writer.writerow(['Letter', 'Count All', 'Count Uppercase', 'Percentage Uppercase'])
             for letter in string.ascii_lowercase:
-                count_all = letter_count[letter]
-                count_uppercase = uppercase_count[letter.upper()]
+                count_all = self.letter_count[letter]
+                count_uppercase = self.uppercase_count[letter.upper()]
                 percentage = (count_uppercase / count_all * 100) if count_all > 0 else 0
                 writer.writerow([letter, count_all, count_uppercase, f'{percentage:.2f}%'])
 
+
+class StatisticsStore:
+    """Sidecar SQLite database with the word and letter totals of all sessions."""
+
+    def __init__(self, db_name=STATISTICS_DB):
+        is_new = not os.path.exists(db_name)
+        self.connection = sqlite3.connect(db_name)
+        self.cursor = self.connection.cursor()
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS WordCount (
+            word TEXT PRIMARY KEY,
+            count INTEGER NOT NULL
+        );
+        """)
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS LetterCount (
+            letter TEXT PRIMARY KEY,
+            count_all INTEGER NOT NULL,
+            count_uppercase INTEGER NOT NULL
+        );
+        """)
+        self.connection.commit()
+        if is_new:
+            self._import_csvs()
+
+    def _import_csvs(self):
+        """Seed a new store with the counts from CSV files written before the store existed."""
+        statistics = TextStatistics()
+        if os.path.exists(WORD_COUNT_CSV):
+            with open(WORD_COUNT_CSV, newline='') as csvfile:
+                for row in list(csv.reader(csvfile))[1:]:
+                    statistics.word_count[row[0]] = int(row[1])
+        if os.path.exists(LETTER_COUNT_CSV):
+            with open(LETTER_COUNT_CSV, newline='') as csvfile:
+                for row in list(csv.reader(csvfile))[1:]:
+                    statistics.letter_count[row[0]] = int(row[1])
+                    statistics.uppercase_count[row[0].upper()] = int(row[2])
+        self.add(statistics)
+
+    def add(self, statistics):
+        """Add the counts of one session to the stored totals."""
+        with self.connection:
+            self.cursor.executemany("""
+            INSERT INTO WordCount (word, count) VALUES (?, ?)
+            ON CONFLICT(word) DO UPDATE SET count = count + excluded.count
+            """, statistics.word_count.items())
+            self.cursor.executemany("""
+            INSERT INTO LetterCount (letter, count_all, count_uppercase) VALUES (?, ?, ?)
+            ON CONFLICT(letter) DO UPDATE SET
+                count_all = count_all + excluded.count_all,
+                count_uppercase = count_uppercase + excluded.count_uppercase
+            """, [(letter, count, statistics.uppercase_count[letter.upper()])
+                  for letter, count in statistics.letter_count.items()])
+
+    def totals(self):
+        """Return the stored totals as a TextStatistics object."""
+        statistics = TextStatistics()
+        self.cursor.execute("SELECT word, count FROM WordCount ORDER BY rowid")
+        statistics.word_count = dict(self.cursor.fetchall())
+        for letter, count_all, count_uppercase in self.cursor.execute("SELECT * FROM LetterCount"):
+            statistics.letter_count[letter] = count_all
+            statistics.uppercase_count[letter.upper()] = count_uppercase
+        return statistics
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+
+class Clock:
+    """Current time for new records.
+
+    Inside frozen(), every record created in the same thread gets one snapshot of
+    the time, so a batch shares a single creation date and "today".
+    """
+    _local = threading.local()
+
+    @classmethod
+    def now(cls):
+        """Return the frozen snapshot, or the current time outside frozen()."""
+        snapshot = getattr(cls._local, 'snapshot', None)
+        return snapshot[0] if snapshot else datetime.now()
+
+    @classmethod
+    def timestamp(cls):
+        """Return the frozen snapshot, or the current time, as integer epoch seconds."""
+        snapshot = getattr(cls._local, 'snapshot', None)
+        return snapshot[1] if snapshot else int(time.time())
+
+    @classmethod
+    @contextmanager
+    def frozen(cls):
+        """Use one snapshot of the current time until the block ends."""
+        previous = getattr(cls._local, 'snapshot', None)
+        now = datetime.now()
+        cls._local.snapshot = (now, int(now.timestamp()))
+        try:
+            yield now
+        finally:
+            cls._local.snapshot = previous
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def format_timestamp(timestamp):
+    """Format epoch seconds as YYYY-MM-DD HH:MM:SS; records of a batch share a timestamp, so results are cached."""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class Record:
+    """Base class for all records.
+
+    Records use __slots__ and keep their creation time as integer epoch seconds, so
+    millions of them fit in memory; the date string is only formatted when it is used.
+    """
+    __slots__ = ('text', 'timestamp')
+    # Class-level word and letter statistics of the records published in this session
+    statistics = TextStatistics()
+    # Shared writer for the news feed; replace it to change the file or flush policy.
+    # Pipelines flush it after each input file and each menu record, so it does not flush per record.
+    feed_writer = FeedWriter(flush_every=None)
+
+    def __init__(self, text):
+        self.text = text
+        self.timestamp = Clock.timestamp()  # The current date and time when the record is created
+
+    @property
+    def date(self):
+        """The creation date and time formatted as YYYY-MM-DD HH:MM:SS."""
+        return format_timestamp(self.timestamp)
+
+    def publish(self):
+        """Publishes the record and updates the text statistics."""
+        # Count the current record's words and letters
+        Record.statistics.add(self.text)
+
+    @classmethod
+    def finalize_and_update_csvs(cls):
+        """Add this session's statistics to the stored totals and regenerate word and letter count CSVs."""
+        store = StatisticsStore()
+        store.add(cls.statistics)  # Only this session's counts are written, not the whole feed history
+        totals = store.totals()
+        store.close()
+        cls.statistics = TextStatistics()  # Start a new session so the same counts are not added twice
+
+        totals.write_word_count_csv()
+        totals.write_letter_count_csv()
+
+    @staticmethod
+    def generate_word_count_csv(text, file_path=WORD_COUNT_CSV):
+        """Generate CSV with word counts."""
+        statistics = TextStatistics()
+        statistics.add(text)
+        statistics.write_word_count_csv(file_path)
+
+    @staticmethod
+    def generate_letter_count_csv(text, file_path=LETTER_COUNT_CSV):
+        """Generate CSV with letter counts, uppercase counts, and percentage of uppercase."""
+        statistics = TextStatistics()
+        statistics.add(text)
+        statistics.write_letter_count_csv(file_path)
+
     def _write_to_file(self, record):
-        with open(FILE_NAME, 'a') as file:
-            file.write(record)  # Append the record to the file
+        Record.feed_writer.write(record)  # Append the record through the shared feed writer
+
+
+# Flush the news feed even when the program ends without closing it
+atexit.register(lambda: Record.feed_writer.close())
 
 
 class News(Record):
     """Class for News records."""
+    __slots__ = ('city',)
+
     def __init__(self, text, city):
         super().__init__(text)
         self.city = city  # The city where the news is related to
 
+    def format(self):
+        """Return the News record as it is written to the news feed."""
+        return f"News\nDate: {self.date}\nCity: {self.city}\n{self.text}\n\n"
+
     def publish(self):
         """Override publish method to include city information."""
-        record = f"News\nDate: {self.date}\nCity: {self.city}\n{self.text}\n\n"
+        record = self.format()
         self._write_to_file(record)  # Write the record to the file
         super().publish()  # Accumulate the text in the Record class
         return record  # Return the record for reporting
@@ -100,6 +370,8 @@ class News(Record):
 
 class PrivateAd(Record):
     """Class for Private Ad records."""
+    __slots__ = ('expiration_date_str', 'days_left')
+
     def __init__(self, text, expiration_date_str):
         super().__init__(text)
         self.expiration_date_str = expiration_date_str  # Store the date as-is before validation
@@ -108,32 +380,44 @@ class PrivateAd(Record):
             raise ValueError("Invalid date format. Use YYYY-MM-DD.")  # Raise an error if the date is invalid
         self.days_left = self.calculate_days_left()  # Calculate days left until expiration
 
+    @staticmethod
+    @lru_cache(maxsize=DATE_CACHE_SIZE)
+    def parse_date(date_str):
+        """Parse a YYYY-MM-DD date string into a datetime, or return None if incorrect; results are cached."""
+        try:
+            return datetime.strptime(date_str, '%Y-%m-%d')  # Check if the format is correct (YYYY-MM-DD)
+        except ValueError:
+            return None  # Return None for invalid input
+
     @staticmethod
     def validate_date(date_str):
         """Checks the date format and returns a valid formatted date string or None if incorrect."""
         date_str = date_str.replace("/", "-")  # Replace slashes with dashes to handle user input errors
 
         # Validate the final formatted date
-        try:
-            datetime.strptime(date_str, '%Y-%m-%d')  # Check if the format is correct (YYYY-MM-DD)
-            return date_str  # Return formatted date if it's valid
-        except ValueError:
-            return None  # Return None for invalid input
+        expiration_date = PrivateAd.parse_date(date_str)
+        if expiration_date is None:
+            return None
+        return expiration_date.strftime('%Y-%m-%d')  # Zero-padded, e.g. 2026-1-5 becomes 2026-01-05
 
     def calculate_days_left(self):
         """Calculates the number of days until the expiration date."""
-        expiration_date = datetime.strptime(self.expiration_date_str, '%Y-%m-%d')
-        today = datetime.now()  # Get the current date
+        expiration_date = PrivateAd.parse_date(self.expiration_date_str)  # Parsed once per distinct date
+        today = Clock.now()  # Get the current date, shared by the whole batch
         return max((expiration_date - today).days, 0)  # Ensure the value is not negative
 
-    def publish(self):
-        """Publishes the Private Ad record."""
-        record = (
+    def format(self):
+        """Return the Private Ad record as it is written to the news feed."""
+        return (
             f"Private Ad\n"
             f"Date: {self.date} | "
             f"Expiration: {self.expiration_date_str} | {self.days_left} days left\n"
             f"{self.text}\n\n"
         )
+
+    def publish(self):
+        """Publishes the Private Ad record."""
+        record = self.format()
         self._write_to_file(record)  # Write the record to the file
         super().publish()  # Accumulate the text in the Record class
         return record  # Return the record for reporting
@@ -141,6 +425,8 @@ class PrivateAd(Record):
 
 class Comment(Record):
     """Class for unique records."""
+    __slots__ = ('nickname', 'words_num')
+
     def __init__(self, nickname, text):
         super().__init__(text)
         self.nickname = nickname  # The nickname of the commenter
@@ -149,169 +435,469 @@ class Comment(Record):
     def words_count(self):
         """Counts the number of words in the comment, excluding punctuation."""
         if isinstance(self.text, str):
-            # Remove punctuation and split the text into words
-            cleaned_text = re.sub(r'[^\w\s]', '', self.text)  # Remove all non-word characters except spaces
-            words = cleaned_text.split()  # Split the cleaned text into words
-            return len(words)  # Return the number of words
+            return count_words(self.text)  # Count tokens that contain at least one word character
         else:
             return 0  # Return 0 if the text is not a string
 
+    def format(self):
+        """Return the Comment record as it is written to the news feed."""
+        return f"Nickname: {self.nickname}\nDate: {self.date}\n{self.text}\nWords count: {self.words_num}\n\n"
+
     def publish(self):
         """Publish Comment record."""
-        record = f"Nickname: {self.nickname}\nDate: {self.date}\n{self.text}\nWords count: {self.words_num}\n\n"
+        record = self.format()
         self._write_to_file(record)  # Write the record to the file
         super().publish()  # Accumulate the text in the Record class
         return record  # Return the record for reporting
 
 
-class FileReader:
-    """Class to read records from a text file and process them."""
-    def __init__(self, file_path=DEFAULT_INPUT_FILE):
-        self.file_path = file_path
+class FeedSink:
+    """Pipeline sink that appends records to the news feed."""
+    name = 'feed'
 
-    def process_file(self):
-        if not os.path.exists(self.file_path):
-            print(f"File '{self.file_path}' does not exist.")
-            return
+    def write(self, records):
+        for record in records:
+            Record.feed_writer.write(record.format())
 
-        with open(self.file_path, 'r') as file:
-            data = file.read().strip().split('---')
+    def flush(self):
+        Record.feed_writer.flush()
 
-        for record_data in data:
-            record_lines = record_data.strip().split('\n')
-            if not record_lines:
-                continue
-            record_type = record_lines[0].strip()
-            if record_type == 'News':
-                text = record_lines[1].split(':', 1)[1].strip()
-                city = record_lines[2].split(':', 1)[1].strip()
-                record = News(text_normalize(text), text_normalize(city))
-            elif record_type == 'Private Ad':
-                text = record_lines[1].split(':', 1)[1].strip()
-                expiration_date_str = record_lines[2].split(':', 1)[1].strip()
-                record = PrivateAd(text_normalize(text), expiration_date_str)
-            elif record_type == 'Comment':
-                nickname = record_lines[1].split(':', 1)[1].strip()
-                text = record_lines[2].split(':', 1)[1].strip()
-                text = fix_misspelling(text)
-                record = Comment(text_normalize(nickname), text_normalize(text))
-            else:
-                print(f"Unknown record type: {record_type}")
-                continue
+    def close(self):
+        Record.feed_writer.flush()
 
-            record.publish()
-            print(f"Processed record: {record_type}")
 
-        # Remove file after successful processing
-        os.remove(self.file_path)
-        print(f"File '{self.file_path}' processed and removed.")
+class StatisticsSink:
+    """Pipeline sink that counts words and letters, optionally updating the CSVs on close."""
+    name = 'statistics'
 
+    def __init__(self, update_csvs=False):
+        self.update_csvs = update_csvs
 
-class JsonReader:
-    """Class to read records from a json file and process them."""
-    def __init__(self, file_path=DEFAULT_INPUT_JSON):
+    def write(self, records):
+        for record in records:
+            Record.statistics.add(record.text)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.update_csvs:
+            Record.finalize_and_update_csvs()
+
+
+class DatabaseSink:
+    """Pipeline sink that saves each batch of records in one database transaction."""
+    name = 'database'
+
+    def __init__(self, db_saver):
+        self.db_saver = db_saver
+
+    def write(self, records):
+        self.db_saver.save_batch(records)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordPipeline:
+    """Validates records and passes them in batches to every sink.
+
+    Sinks have write(records), flush() and close() methods. When a timings dict
+    is given, the seconds spent in each sink are added under the sink's name.
+    """
+
+    def __init__(self, sinks, batch_size=DEFAULT_BATCH_SIZE, timings=None):
+        self.sinks = list(sinks)
+        self.batch_size = batch_size
+        self.timings = timings
+        self.pending = []  # Valid records waiting for the next batch
+        self.count = 0  # Number of records accepted so far
+
+    @staticmethod
+    def validate(record):
+        """Return an error message for a record that cannot be published, or None if it is valid."""
+        if not isinstance(record.text, str) or not record.text:
+            return "text is missing"
+        if isinstance(record, News) and not isinstance(record.city, str):
+            return "city is missing"
+        if isinstance(record, Comment) and not isinstance(record.nickname, str):
+            return "nickname is missing"
+        return None
+
+    def add(self, record):
+        """Validate a record and queue it for the sinks; return False if it was rejected."""
+        error = self.validate(record)
+        if error:
+            print(f"Invalid {type(record).__name__} record skipped: {error}.")
+            return False
+        self.pending.append(record)
+        self.count += 1
+        print(f"Processed record: {type(record).__name__}")
+        if len(self.pending) >= self.batch_size:
+            self._write_pending()
+        return True
+
+    def run(self, records):
+        """Add every record of an iterable and return the number accepted."""
+        return sum(1 for record in records if self.add(record))
+
+    def _call_sinks(self, method, *args):
+        """Call a method on every sink, timing each sink when timings are collected."""
+        for sink in self.sinks:
+            started = time.perf_counter()
+            getattr(sink, method)(*args)
+            if self.timings is not None:
+                self.timings[sink.name] = self.timings.get(sink.name, 0.0) + time.perf_counter() - started
+
+    def _write_pending(self):
+        if self.pending:
+            batch, self.pending = self.pending, []
+            self._call_sinks('write', batch)
+
+    def flush(self):
+        """Send queued records to the sinks and make the sinks persist them."""
+        self._write_pending()
+        self._call_sinks('flush')
+
+    def close(self):
+        """Flush the remaining records and close every sink."""
+        self.flush()
+        self._call_sinks('close')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Keep the records read before a reader error, but do not retry after a database error
+        if exc_type is None or not issubclass(exc_type, sqlite3.Error):
+            self.close()
+        return False
+
+
+def build_pipeline(db_saver=None, feed=True, update_csvs=False, batch_size=DEFAULT_BATCH_SIZE, timings=None,
+                   statistics=True):
+    """Create a pipeline with the news feed, statistics and, when a saver is given, database sinks."""
+    sinks = [FeedSink()] if feed else []
+    if statistics:
+        sinks.append(StatisticsSink(update_csvs))
+    if db_saver is not None:
+        sinks.append(DatabaseSink(db_saver))
+    return RecordPipeline(sinks, batch_size, timings)
+
+
+class RecordReader:
+    """Base class for readers that turn an input file into records and send them through a pipeline."""
+    def __init__(self, file_path, db_saver=None, pipeline=None):
         self.file_path = file_path
+        self.db_saver = db_saver  # Used for the default pipeline when no pipeline is given
+        self.pipeline = pipeline  # Shared pipeline, left open after the file is processed
 
-    def process_json(self):
+    def process(self):
+        """Send every record of the file through the pipeline and remove the file."""
         if not os.path.exists(self.file_path):
             print(f"File '{self.file_path}' does not exist.")
             return
 
-        with open(self.file_path, 'r') as file:
-            data = json.load(file)
-
-        for record_type, records in data.items():
-            if record_type == 'News':
-                for news in records:
-                    text = news.get("Text")
-                    city = news.get("City")
-                    record = News(text_normalize(text), text_normalize(city))
-                    record.publish()
-                    print(f"Processed record: {record_type}")
-            elif record_type == 'PrivateAd':
-                for ads in records:
-                    text = ads.get("Text")
-                    expiration_date_str = ads.get("Expires")
-                    record = PrivateAd(text_normalize(text), expiration_date_str)
-                    record.publish()
-                    print(f"Processed record: {record_type}")
-            elif record_type == 'Comment':
-                for comment in records:
-                    nickname = comment.get("Nickname")
-                    text = comment.get("Text")
-                    record = Comment(text_normalize(nickname), text_normalize(text))
-                    record.publish()
-                    print(f"Processed record: {record_type}")
-            else:
-                print(f"Unknown record type: {record_type}")
+        if self.pipeline is None:
+            with build_pipeline(self.db_saver) as pipeline:
+                pipeline.run(self.read_records())
+        else:
+            self.pipeline.run(self.read_records())
+            self.pipeline.flush()  # Make sure all records are saved before the input file is removed
 
         # Remove file after successful processing
         os.remove(self.file_path)
         print(f"File '{self.file_path}' processed and removed.")
 
+    def read_records(self):
+        """Yield normalized records from the file without publishing them, all using one clock snapshot."""
+        with Clock.frozen():
+            yield from self._iter_records()
 
-class XMLReader:
-    """Class to read records from a xml file and process them."""
-    def __init__(self, file_path=DEFAULT_INPUT_XML):
-        self.file_path = file_path
+    def _iter_records(self):
+        """Yield the records of the file; implemented by each reader."""
+        raise NotImplementedError
 
-    def process_xml(self):
-        if not os.path.exists(self.file_path):
-            print(f"File '{self.file_path}' does not exist.")
-            return
 
-        with open(self.file_path, 'r', encoding='utf-8-sig') as file:
-            data = ET.parse(file)
-            root = data.getroot()
+def iter_record_blocks(file, delimiter='---', buffer_size=RECORD_BUFFER_SIZE):
+    """Yield the stripped text of each delimiter-separated record block from an open file."""
+    pending = ''  # Text after the last delimiter seen so far
+    while True:
+        chunk = file.read(buffer_size)
+        if not chunk:
+            break
+        blocks = (pending + chunk).split(delimiter)
+        pending = blocks.pop()  # The last part may continue, or hold half a delimiter, in the next chunk
+        for block in blocks:
+            block = block.strip()
+            if block:
+                yield block
+    pending = pending.strip()
+    if pending:
+        yield pending
+
+
+class FileReader(RecordReader):
+    """Class to read records from a text file and process them."""
+    def __init__(self, file_path=DEFAULT_INPUT_FILE, db_saver=None, pipeline=None):
+        super().__init__(file_path, db_saver, pipeline)
 
-        for records in root.iter('Items'):
-            for record_type in records:
-                record_type = record_type.tag
+    def process_file(self):
+        self.process()
+
+    def _iter_records(self):
+        with open(self.file_path, 'r') as file:
+            for record_data in iter_record_blocks(file):  # Read one record block at a time
+                record_lines = record_data.split('\n')
+                record_type = record_lines[0].strip()
                 if record_type == 'News':
-                    for news in root.iter('News'):
-                        if 'text' in news.attrib:
-                            text = news.attrib['text']
-                        for city in news.iter('City'):
-                            city = city.text
-                            record = News(text_normalize(text), text_normalize(city))
-                            record.publish()
-                            print(f"Processed record: {record_type}")
-                elif record_type == 'PrivateAd':
-                    for ads in root.iter('PrivateAd'):
-                        if 'text' in ads.attrib:
-                            text = ads.attrib['text']
-                        for expiration_date_str in ads.iter('Expires'):
-                            expiration_date_str = expiration_date_str.text
-                            record = PrivateAd(text_normalize(text), expiration_date_str)
-                            record.publish()
-                            print(f"Processed record: {record_type}")
+                    text = record_lines[1].split(':', 1)[1].strip()
+                    city = record_lines[2].split(':', 1)[1].strip()
+                    yield News(text_normalize(text), normalize_field(city))
+                elif record_type == 'Private Ad':
+                    text = record_lines[1].split(':', 1)[1].strip()
+                    expiration_date_str = record_lines[2].split(':', 1)[1].strip()
+                    yield PrivateAd(text_normalize(text), expiration_date_str)
                 elif record_type == 'Comment':
-                    for comment in root.iter('Comment'):
-                        if 'text' in comment.attrib:
-                            text = comment.attrib['text']
-                        for nickname in comment.iter('Nickname'):
-                            nickname = nickname.text
-                            record = Comment(text_normalize(nickname), text_normalize(text))
-                            record.publish()
-                            print(f"Processed record: {record_type}")
+                    nickname = record_lines[1].split(':', 1)[1].strip()
+                    text = record_lines[2].split(':', 1)[1].strip()
+                    yield Comment(normalize_field(nickname), fix_misspelling(text))  # fix_misspelling also normalizes
                 else:
                     print(f"Unknown record type: {record_type}")
 
-        # Remove file after successful processing
-        os.remove(self.file_path)
-        print(f"File '{self.file_path}' processed and removed.")
+
+class JsonStreamParser:
+    """Incremental parser for a json object of record arrays, e.g. {"News": [...], "Comment": [...]}."""
+
+    def __init__(self, file, buffer_size=RECORD_BUFFER_SIZE):
+        self.file = file
+        self.buffer_size = buffer_size
+        self.buffer = ''
+        self.pos = 0  # Position of the next unread character in the buffer
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _read_more(self):
+        """Append the next chunk of the file to the buffer, dropping the part already parsed."""
+        chunk = self.file.read(self.buffer_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _next_char(self):
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read_more():
+                raise ValueError("Unexpected end of json file.")
+
+    def _expect(self, chars):
+        """Consume the next character and check that it is one of chars."""
+        char = self._next_char()
+        if char not in chars:
+            raise ValueError(f"Invalid json: expected one of {chars!r}, got {char!r}.")
+        self.pos += 1
+        return char
+
+    def _decode_value(self):
+        """Decode one complete json value, reading more of the file until it is available."""
+        self._next_char()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number may continue in the next chunk, e.g. '1.' + '5' or '1' + 'e5',
+                # so a value is only complete once the separator after it has been read
+                after = end
+                while after < len(self.buffer) and self.buffer[after].isspace():
+                    after += 1
+                if self.eof or (after < len(self.buffer) and self.buffer[after] in ',:]}'):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._read_more()
+
+    def __iter__(self):
+        """Yield (record_type, record) pairs one array element at a time."""
+        self._expect('{')
+        if self._next_char() == '}':
+            return
+        while True:
+            record_type = self._decode_value()
+            self._expect(':')
+            if self._next_char() == '[':
+                self.pos += 1
+                if self._next_char() == ']':
+                    self.pos += 1
+                else:
+                    while True:
+                        yield record_type, self._decode_value()
+                        if self._expect(',]') == ']':
+                            break
+            else:
+                yield record_type, self._decode_value()
+            if self._expect(',}') == '}':
+                return
+
+
+def iter_json_lines(file):
+    """Yield (record_type, record) pairs from a JSON Lines file with one {"Type": ..., ...} object per line."""
+    for line in file:
+        line = line.strip()
+        if line:
+            data = json.loads(line)
+            yield data.get("Type"), data
+
+
+class JsonReader(RecordReader):
+    """Class to read records from a json or json lines file and process them."""
+    def __init__(self, file_path=DEFAULT_INPUT_JSON, db_saver=None, pipeline=None):
+        super().__init__(file_path, db_saver, pipeline)
+
+    def process_json(self):
+        self.process()
+
+    def _iter_records(self):
+        with open(self.file_path, 'r') as file:
+            # Records are parsed one at a time, so normalization and saving start before the file is read
+            if self.file_path.endswith('.jsonl'):
+                data = iter_json_lines(file)
+            else:
+                data = JsonStreamParser(file)
+            for record_type, record_data in data:
+                record = self._create_record(record_type, record_data)
+                if record is not None:
+                    yield record
+
+    @staticmethod
+    def _create_record(record_type, data):
+        """Create a record from one json object, or return None for an unknown type."""
+        if record_type == 'News':
+            return News(text_normalize(data.get("Text")), normalize_field(data.get("City")))
+        elif record_type == 'PrivateAd':
+            return PrivateAd(text_normalize(data.get("Text")), data.get("Expires"))
+        elif record_type == 'Comment':
+            return Comment(normalize_field(data.get("Nickname")), text_normalize(data.get("Text")))
+        print(f"Unknown record type: {record_type}")
+        return None
+
+
+class XMLReader(RecordReader):
+    """Class to read records from a xml file and process them."""
+    def __init__(self, file_path=DEFAULT_INPUT_XML, db_saver=None, pipeline=None):
+        super().__init__(file_path, db_saver, pipeline)
+
+    def process_xml(self):
+        self.process()
+
+    def _iter_records(self):
+        with open(self.file_path, 'rb') as file:
+            parents = []  # Elements that enclose the current one
+            for event, element in ET.iterparse(file, events=('start', 'end')):
+                if event == 'start':
+                    parents.append(element)
+                    continue
+
+                parents.pop()
+                if element.tag == 'Items' and parents:
+                    parents[-1].remove(element)  # Drop the finished <Items> block
+                elif parents and parents[-1].tag == 'Items':
+                    # Each <News>, <PrivateAd> and <Comment> is handled once, when its end tag is read,
+                    # then detached from <Items>, so memory stays bounded however many records it holds
+                    yield from self._parse_element(element)
+                    parents[-1].remove(element)
+
+    @staticmethod
+    def _parse_element(element):
+        """Create the records described by one child element of <Items>."""
+        text = element.get('text')
+        if element.tag == 'News':
+            return [News(text_normalize(text), normalize_field(city.text)) for city in element.iter('City')]
+        elif element.tag == 'PrivateAd':
+            return [PrivateAd(text_normalize(text), expires.text) for expires in element.iter('Expires')]
+        elif element.tag == 'Comment':
+            return [Comment(normalize_field(nickname.text), text_normalize(text))
+                    for nickname in element.iter('Nickname')]
+        print(f"Unknown record type: {element.tag}")
+        return []
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def date_timestamp(date_str):
+    """Convert a 'YYYY-MM-DD HH:MM:SS' or 'YYYY-MM-DD' string to epoch seconds, or None if it is not a date.
+
+    Date-only strings are parsed like PrivateAd.parse_date, so expiry dates saved
+    without zero padding (2026-1-5) still get a timestamp.
+    """
+    try:
+        return int(datetime.fromisoformat(date_str).timestamp())
+    except (TypeError, ValueError):
+        parsed = PrivateAd.parse_date(date_str) if isinstance(date_str, str) else None
+        return int(parsed.timestamp()) if parsed else None
+
+
+def content_hash(text):
+    """Return the digest of the normalized text that identifies duplicate records."""
+    normalized = ' '.join(text.split()).lower()  # Ignore differences in case and whitespace
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
 
 
 class DatabaseSaver:
     """Class to save records to a database."""
 
-    def __init__(self, db_name="records.db"):
-        """Initialize the database and create the necessary tables if they do not exist."""
+    # Insert statements keyed by table name; duplicates are rejected by the unique text_hash index.
+    # The SQL text never changes, so sqlite3's per-connection statement cache reuses the prepared statements.
+    INSERT_SQL = {
+        'News': "INSERT INTO News (text, city, date, timestamp, text_hash) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(text_hash) DO NOTHING",
+        'PrivateAd': "INSERT INTO PrivateAd (text, expiration_date, expiration_timestamp, days_left, date, timestamp, "
+                     "text_hash) VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(text_hash) DO NOTHING",
+        'Comment': "INSERT INTO Comment (nickname, text, date, timestamp, words_count, text_hash) "
+                   "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(text_hash) DO NOTHING",
+    }
+    # Epoch-second columns kept next to the text dates, keyed by table name, with the text column they mirror
+    TIMESTAMP_COLUMNS = {
+        'News': {'timestamp': 'date'},
+        'PrivateAd': {'timestamp': 'date', 'expiration_timestamp': 'expiration_date'},
+        'Comment': {'timestamp': 'date'},
+    }
+    # Columns indexed for full-text search in the <table>Search FTS5 tables
+    SEARCH_COLUMNS = {
+        'News': ('text', 'city'),
+        'PrivateAd': ('text',),
+        'Comment': ('nickname', 'text'),
+    }
+
+    def __init__(self, db_name="records.db", batch_size=DEFAULT_BATCH_SIZE, profile=DEFAULT_DATABASE_PROFILE):
+        """Initialize the database and create the necessary tables if they do not exist.
+
+        profile names one of DATABASE_PROFILES: 'durable' or 'bulk-load'.
+        """
+        if profile not in DATABASE_PROFILES:
+            raise ValueError(f"Unknown database profile '{profile}'. Use one of: {', '.join(DATABASE_PROFILES)}.")
         self.db_name = db_name
+        self.batch_size = batch_size  # Maximum number of records per transaction in batched mode
+        self.profile = profile
         self.connection = sqlite3.connect(self.db_name)
         self.cursor = self.connection.cursor()
+        self._apply_profile()
         self._create_tables()
 
+    def _apply_profile(self):
+        """Set the pragmas of the database profile on the connection."""
+        for pragma, value in DATABASE_PROFILES[self.profile].items():
+            self.cursor.execute(f"PRAGMA {pragma} = {value}")
+
     def _create_tables(self):
         """Create tables for each record type if they don't already exist."""
         # Create table for News
@@ -320,7 +906,9 @@ class DatabaseSaver:
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             text TEXT NOT NULL,
             city TEXT NOT NULL,
-            date TEXT NOT NULL
+            date TEXT NOT NULL,
+            timestamp INTEGER,
+            text_hash TEXT
         );
         """)
 
@@ -330,8 +918,11 @@ class DatabaseSaver:
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             text TEXT NOT NULL,
             expiration_date TEXT NOT NULL,
+            expiration_timestamp INTEGER,
             days_left INTEGER NOT NULL,
-            date TEXT NOT NULL
+            date TEXT NOT NULL,
+            timestamp INTEGER,
+            text_hash TEXT
         );
         """)
 
@@ -342,56 +933,202 @@ class DatabaseSaver:
             nickname TEXT NOT NULL,
             text TEXT NOT NULL,
             date TEXT NOT NULL,
-            words_count INTEGER NOT NULL
+            timestamp INTEGER,
+            words_count INTEGER NOT NULL,
+            text_hash TEXT
         );
         """)
 
         self.connection.commit()
+        self._migrate_tables()
+        self._create_search_tables()
+
+    def _migrate_tables(self):
+        """Add the text_hash and timestamp columns and their indexes to databases created before they existed."""
+        for table in self.INSERT_SQL:
+            columns = [column[1] for column in self.cursor.execute(f"PRAGMA table_info({table})")]
+            for timestamp_column, date_column in self.TIMESTAMP_COLUMNS[table].items():
+                if timestamp_column not in columns:
+                    self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {timestamp_column} INTEGER")
+                self.cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{timestamp_column} "
+                                    f"ON {table} ({timestamp_column})")
+                # Fill new columns and earlier rows whose date could not be parsed then, e.g. 2026-1-5.
+                # Dates that still cannot be parsed stay NULL and are not found by date-range queries.
+                rows = self.cursor.execute(f"SELECT id, {date_column} FROM {table} "
+                                           f"WHERE {timestamp_column} IS NULL").fetchall()
+                updates = []
+                for row_id, date in rows:
+                    timestamp = date_timestamp(date)
+                    if timestamp is not None:
+                        updates.append((timestamp, row_id))
+                self.cursor.executemany(f"UPDATE {table} SET {timestamp_column} = ? WHERE id = ?", updates)
+            if 'text_hash' not in columns:
+                self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN text_hash TEXT")
+                seen = set()
+                updates = []
+                for row_id, text in self.cursor.execute(f"SELECT id, text FROM {table} ORDER BY id").fetchall():
+                    digest = content_hash(text)
+                    if digest in seen:
+                        continue  # Keep old duplicates, but leave them out of the unique index
+                    seen.add(digest)
+                    updates.append((digest, row_id))
+                self.cursor.executemany(f"UPDATE {table} SET text_hash = ? WHERE id = ?", updates)
+            self.cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_text_hash ON {table} (text_hash)")
+        self.connection.commit()
 
-    def _check_duplicate(self, table, column, value):
-        """Check if a record with the same value exists in the table."""
-        self.cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {column} = ?", (value,))
-        count = self.cursor.fetchone()[0]
-        return count > 0
+    def _create_search_tables(self):
+        """Create FTS5 tables over the record tables, kept in sync by triggers; skipped without FTS5 support."""
+        existing = {row[0] for row in self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        try:
+            for table, columns in self.SEARCH_COLUMNS.items():
+                search_table = f"{table}Search"
+                column_list = ', '.join(columns)
+                new_values = ', '.join(f"new.{column}" for column in columns)
+                old_values = ', '.join(f"old.{column}" for column in columns)
+                self.cursor.executescript(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {search_table} USING fts5(
+                    {column_list}, content='{table}', content_rowid='id', tokenize='porter unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN
+                    INSERT INTO {search_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+                END;
+                CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN
+                    INSERT INTO {search_table} ({search_table}, rowid, {column_list})
+                    VALUES ('delete', old.id, {old_values});
+                END;
+                CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {column_list} ON {table} BEGIN
+                    INSERT INTO {search_table} ({search_table}, rowid, {column_list})
+                    VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {search_table} (rowid, {column_list}) VALUES (new.id, {new_values});
+                END;
+                """)
+                if search_table not in existing:
+                    # Index the rows saved before the search table existed
+                    self.cursor.execute(f"INSERT INTO {search_table} ({search_table}) VALUES ('rebuild')")
+            self.connection.commit()
+        except sqlite3.OperationalError as error:
+            print(f"Full-text search is not available: {error}")
+
+    def _insert(self, table, text, row):
+        """Insert one row and return False if it was skipped as a duplicate."""
+        self.cursor.execute(self.INSERT_SQL[table], row + (content_hash(text),))
+        self.connection.commit()
+        return self.cursor.rowcount > 0
 
     def save_news(self, text, city, date):
         """Save a News record to the database."""
-        if self._check_duplicate("News", "text", text):
+        if not self._insert("News", text, (text, city, date, date_timestamp(date))):
             print("Duplicate News record found. Skipping insert.")
             return
-        self.cursor.execute("""
-        INSERT INTO News (text, city, date) VALUES (?, ?, ?)
-        """, (text, city, date))
-        self.connection.commit()
         print("News record saved.")
 
     def save_private_ad(self, text, expiration_date, days_left, date):
         """Save a Private Ad record to the database."""
-        if self._check_duplicate("PrivateAd", "text", text):
+        row = (text, expiration_date, date_timestamp(expiration_date), days_left, date, date_timestamp(date))
+        if not self._insert("PrivateAd", text, row):
             print("Duplicate Private Ad record found. Skipping insert.")
             return
-        self.cursor.execute("""
-        INSERT INTO PrivateAd (text, expiration_date, days_left, date) VALUES (?, ?, ?, ?)
-        """, (text, expiration_date, days_left, date))
-        self.connection.commit()
         print("Private Ad record saved.")
 
     def save_comment(self, nickname, text, date, words_count):
         """Save a Comment record to the database."""
-        if self._check_duplicate("Comment", "text", text):
+        if not self._insert("Comment", text, (nickname, text, date, date_timestamp(date), words_count)):
             print("Duplicate Comment record found. Skipping insert.")
             return
-        self.cursor.execute("""
-        INSERT INTO Comment (nickname, text, date, words_count) VALUES (?, ?, ?, ?)
-        """, (nickname, text, date, words_count))
-        self.connection.commit()
         print("Comment record saved.")
 
+    @staticmethod
+    def _record_row(record):
+        """Return the table name, text to hash and column values for a record."""
+        if isinstance(record, News):
+            return "News", record.text, (record.text, record.city, record.date, record.timestamp)
+        elif isinstance(record, PrivateAd):
+            return "PrivateAd", record.text, (record.text, record.expiration_date_str,
+                                              date_timestamp(record.expiration_date_str), record.days_left,
+                                              record.date, record.timestamp)
+        elif isinstance(record, Comment):
+            return "Comment", record.text, (record.nickname, record.text, record.date, record.timestamp,
+                                            record.words_num)
+        return None, None, None
+
+    def save_batch(self, records):
+        """Insert a group of records in a single transaction and return the number saved."""
+        rows = {table: [] for table in self.INSERT_SQL}
+
+        for record in records:
+            table, text, row = self._record_row(record)
+            if table is None:
+                print("Unknown record type. Cannot save to database.")
+                continue
+            rows[table].append(row + (content_hash(text),))
+
+        saved = 0
+        with self.connection:  # Commit once for the whole batch, roll back on error
+            for table, table_rows in rows.items():
+                if table_rows:
+                    self.cursor.executemany(self.INSERT_SQL[table], table_rows)
+                    # Rows inserted, without duplicates ignored by ON CONFLICT or rows written by search triggers
+                    saved += self.cursor.rowcount
+        skipped = sum(len(table_rows) for table_rows in rows.values()) - saved
+        print(f"Batch saved: {saved} records, {skipped} duplicates skipped.")
+        return saved
+
+    def batch(self, batch_size=None):
+        """Return a context-managed batch that groups inserts into transactions."""
+        return RecordBatch(self, batch_size or self.batch_size)
+
+    def save_many(self, records):
+        """Save an iterable of records using batched transactions and return the number saved."""
+        with self.batch() as batch:
+            for record in records:
+                batch.add(record)
+        return batch.saved
+
     def close(self):
         """Close the database connection."""
         self.connection.close()
 
 
+class RecordBatch:
+    """Collects records and writes them to the database in groups of batch_size."""
+
+    def __init__(self, db_saver, batch_size=DEFAULT_BATCH_SIZE):
+        self.db_saver = db_saver
+        self.batch_size = batch_size
+        self.pending = []  # Records waiting for the next transaction
+        self.saved = 0  # Number of records inserted so far
+
+    def add(self, record):
+        """Queue a record and write the batch once it is full."""
+        self.pending.append(record)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all queued records in one transaction."""
+        if self.pending:
+            records, self.pending = self.pending, []
+            self.saved += self.db_saver.save_batch(records)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Keep the records parsed before a reader error, but do not retry after a database error
+        if exc_type is None or not issubclass(exc_type, sqlite3.Error):
+            self.flush()
+        return False
+
+
+# Reader classes by input file extension
+INPUT_READERS = {
+    '.txt': FileReader,
+    '.json': JsonReader,
+    '.jsonl': JsonReader,
+    '.xml': XMLReader,
+}
+
+
 class DatabaseRecordSaver:
     """Class to save records into the database using DatabaseSaver."""
 
@@ -410,11 +1147,236 @@ class DatabaseRecordSaver:
             print("Unknown record type. Cannot save to database.")
 
 
+def read_input_file(file_path):
+    """Parse and normalize one input file, choosing the reader by extension; runs in a worker process."""
+    reader_class = INPUT_READERS[os.path.splitext(file_path)[1].lower()]
+    return list(reader_class(file_path).read_records())
+
+
+def find_input_files(source):
+    """Return the txt, json and xml files in a folder, or the files matching a glob pattern."""
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source)
+    return sorted(path for path in paths
+                  if os.path.isfile(path) and os.path.splitext(path)[1].lower() in INPUT_READERS)
+
+
+def ingest_files(source, db_saver=None, max_workers=None, pipeline=None):
+    """Parse input files in parallel worker processes and send their records through a pipeline here.
+
+    Only this process writes to the sinks. Without a pipeline, the default one for db_saver
+    is used. Returns the numbers of processed files, failed files and published records;
+    failed files are left in place.
+    """
+    file_paths = find_input_files(source)
+    if not file_paths:
+        print(f"No input files found in '{source}'.")
+        return 0, 0, 0
+
+    processed = failed = record_count = 0
+    with concurrent_futures.ProcessPoolExecutor(max_workers=max_workers) as executor, \
+            nullcontext(pipeline) if pipeline else build_pipeline(db_saver) as pipeline:
+        futures = {executor.submit(read_input_file, file_path): file_path for file_path in file_paths}
+        for future in concurrent_futures.as_completed(futures):
+            file_path = futures[future]
+            try:
+                records = future.result()
+            except Exception as error:
+                print(f"Failed to process '{file_path}': {error}")
+                failed += 1
+                continue
+            record_count += pipeline.run(records)
+            pipeline.flush()  # Make sure all records are saved before the input file is removed
+            os.remove(file_path)  # Remove file after successful processing
+            print(f"File '{file_path}' processed and removed.")
+            processed += 1
+
+    print(f"Processed {processed} files, {failed} failed.")
+    return processed, failed, record_count
+
+
+class FileDone:
+    """Queue marker sent after the last records of an input file."""
+    def __init__(self, file_path, error=None):
+        self.file_path = file_path
+        self.error = error  # Exception raised while reading the file, if any
+
+
+class ServiceStopped(Exception):
+    """Raised to readers when the consumer has stopped and will take no more records."""
+
+
+class IngestService:
+    """Asyncio ingestion service with a bounded queue between parsing and persistence.
+
+    Readers run in threads and put chunks of records into the queue, waiting when it
+    is full. One consumer task sends them through the pipeline in a dedicated thread,
+    which also owns the SQLite connection.
+    """
+
+    def __init__(self, db_name="records.db", batch_size=DEFAULT_BATCH_SIZE, queue_size=QUEUE_SIZE, max_readers=2,
+                 profile=DEFAULT_DATABASE_PROFILE):
+        self.db_name = db_name
+        self.batch_size = batch_size
+        self.profile = profile  # Database profile of the service's DatabaseSaver
+        self.queue_size = queue_size
+        self.readers = asyncio.Semaphore(max_readers)  # Input files read at the same time
+        self.queue = None
+        self.db_executor = None
+        self.db_saver = None
+        self.pipeline = None
+        self.consumer = None
+        self.tasks = set()  # Files being read in watch mode
+        self.processed = self.failed = 0
+
+    async def _in_db_thread(self, function, *args):
+        """Run a function in the thread that owns the database connection."""
+        return await asyncio.get_running_loop().run_in_executor(self.db_executor, function, *args)
+
+    async def start(self):
+        """Open the database and the pipeline and start the consumer task."""
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.db_executor = concurrent_futures.ThreadPoolExecutor(max_workers=1)
+        self.db_saver = await self._in_db_thread(DatabaseSaver, self.db_name, self.batch_size, self.profile)
+        self.pipeline = build_pipeline(self.db_saver, update_csvs=True, batch_size=self.batch_size)
+        self.consumer = asyncio.create_task(self._consume())
+
+    async def stop(self):
+        """Wait until all queued records are saved, then close the pipeline and the database.
+
+        Raises the consumer's error, after closing the database, if saving records failed.
+        """
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)  # Let started files finish
+        try:
+            await self._put(None)
+        except ServiceStopped:
+            pass  # The consumer already ended with an error, there is nobody to tell
+        error = None
+        try:
+            await self.consumer
+            await self._in_db_thread(self.pipeline.close)
+        except Exception as consumer_error:
+            error = consumer_error  # Do not retry the pending records, as RecordPipeline does after a database error
+        await self._in_db_thread(self.db_saver.close)
+        self.db_executor.shutdown()
+        print(f"Processed {self.processed} files, {self.failed} failed.")
+        if error is not None:
+            raise error
+
+    async def _put(self, item):
+        """Put an item into the queue, waiting while it is full; raise ServiceStopped if the consumer ends first."""
+        if self.consumer.done():
+            raise ServiceStopped()
+        put = asyncio.ensure_future(self.queue.put(item))
+        await asyncio.wait({put, self.consumer}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            raise ServiceStopped()
+
+    def _read_file(self, file_path, loop):
+        """Read a file in a worker thread and put its records into the queue in chunks."""
+        def put(item):
+            asyncio.run_coroutine_threadsafe(self._put(item), loop).result()  # Blocks while the queue is full
+
+        chunk = []
+        error = None
+        try:
+            reader_class = INPUT_READERS[os.path.splitext(file_path)[1].lower()]
+            for record in reader_class(file_path).read_records():
+                chunk.append(record)
+                if len(chunk) >= QUEUE_CHUNK_SIZE:
+                    put(chunk)
+                    chunk = []
+        except ServiceStopped:
+            print(f"Stopped reading '{file_path}': records are no longer being saved.")
+            return
+        except Exception as read_error:
+            error = read_error
+        try:
+            put(chunk)
+            put(FileDone(file_path, error))
+        except ServiceStopped:
+            print(f"Stopped reading '{file_path}': records are no longer being saved.")
+
+    async def ingest_file(self, file_path):
+        """Read one input file into the queue."""
+        async with self.readers:
+            await asyncio.to_thread(self._read_file, file_path, asyncio.get_running_loop())
+
+    async def _consume(self):
+        """Send queued records through the pipeline and remove files once their records are saved."""
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                break
+            if isinstance(item, FileDone):
+                await self._in_db_thread(self.pipeline.flush)  # Make sure the file's records are saved
+                if item.error is not None:
+                    print(f"Failed to process '{item.file_path}': {item.error}")
+                    self.failed += 1
+                else:
+                    os.remove(item.file_path)  # Remove file after successful processing
+                    print(f"File '{item.file_path}' processed and removed.")
+                    self.processed += 1
+            elif item:
+                await self._in_db_thread(self.pipeline.run, item)
+
+    async def ingest(self, source):
+        """Read all input files of a folder or glob pattern."""
+        await asyncio.gather(*(self.ingest_file(file_path) for file_path in find_input_files(source)))
+
+    async def watch(self, folder, interval=WATCH_INTERVAL):
+        """Keep reading new input files as they appear in a folder, until cancelled.
+
+        A file is only read once its size and modification time are the same in two
+        scans in a row, so files that are still being written are left alone. A file
+        that failed is read again when it changes.
+        """
+        taken = {}  # (size, mtime) of the files already taken, including failed ones
+        previous = {}  # (size, mtime) of the files found by the last scan
+        while not self.consumer.done():  # Stop watching once records can no longer be saved
+            current = {}
+            for file_path in find_input_files(folder):
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue  # Removed since the folder was listed
+                current[file_path] = (stat.st_size, stat.st_mtime_ns)
+            for file_path, signature in current.items():
+                if signature == previous.get(file_path) and signature != taken.get(file_path):
+                    taken[file_path] = signature
+                    task = asyncio.create_task(self.ingest_file(file_path))
+                    self.tasks.add(task)
+                    task.add_done_callback(self.tasks.discard)
+            # Forget removed files so the names can be reused
+            taken = {file_path: signature for file_path, signature in taken.items() if file_path in current}
+            previous = current
+            await asyncio.sleep(interval)
+
+
+async def run_service(source, db_name="records.db", watch=False, interval=WATCH_INTERVAL,
+                      profile=DEFAULT_DATABASE_PROFILE, service=None):
+    """Ingest a folder or glob once, or watch a folder until interrupted, and return the service."""
+    service = service or IngestService(db_name, profile=profile)
+    await service.start()
+    try:
+        if watch:
+            await service.watch(source, interval)
+        else:
+            await service.ingest(source)
+    finally:
+        await service.stop()
+    return service
+
+
 def main():
     """Main function to interact with the user and handle their input."""
-    # Initialize DatabaseSaver and DatabaseRecordSaver
+    # Initialize DatabaseSaver and the pipeline that sends records to the feed, statistics and database
     db_saver = DatabaseSaver()
-    db_record_saver = DatabaseRecordSaver(db_saver)
+    pipeline = build_pipeline(db_saver, update_csvs=True)
 
     # List to keep track of records added during the session
     records = []
@@ -428,17 +1390,18 @@ def main():
         print("4. Process records from txt file")
         print("5. Process records from json file")
         print("6. Process records from xml file")
-        print("7. Exit")
+        print("7. Process all files from a folder")
+        print("8. Exit")
 
-        choice = input("Enter your choice (1/2/3/4/5/6/7): ")
+        choice = input("Enter your choice (1/2/3/4/5/6/7/8): ")
 
         if choice == '1':  # Add News
             text = input("Enter the news text: ")  # Get the news text from the user
             city = input("Enter the city: ")  # Get the city related to the news
             news_record = News(text, city)  # Create a News record
-            record = news_record.publish()  # Publish the news
-            records.append(record)  # Add the record to the list
-            db_record_saver.save_record(news_record)  # Save the record to the database
+            if pipeline.add(news_record):  # Publish the news
+                pipeline.flush()  # Write it to the feed and the database right away
+                records.append(news_record.format())  # Add the record to the list
 
         elif choice == '2':  # Add PrivateAd
             text = input("Enter the ad text: ")  # Get the ad text from the user
@@ -452,43 +1415,46 @@ def main():
                     break  # Exit the loop if date is valid
                 print("Invalid date format. Please enter the date again in the correct format (YYYY-MM-DD).")
 
-            record = private_ad_record.publish()  # Publish the PrivateAd
-            records.append(record)  # Add the record to the list
-            db_record_saver.save_record(private_ad_record)  # Save the record to the database
+            if pipeline.add(private_ad_record):  # Publish the PrivateAd
+                pipeline.flush()  # Write it to the feed and the database right away
+                records.append(private_ad_record.format())  # Add the record to the list
 
         elif choice == '3':  # Add Comment
             nickname = input("Enter your nickname: ")  # Get the user's nickname
             text = input("Enter your comment: ")  # Get the comment text
             comments = Comment(nickname, text)  # Create a Comment record
-            record = comments.publish()  # Publish the comment
-            records.append(record)  # Add the record to the list
-            db_record_saver.save_record(comments)  # Save the record to the database
+            if pipeline.add(comments):  # Publish the comment
+                pipeline.flush()  # Write it to the feed and the database right away
+                records.append(comments.format())  # Add the record to the list
 
         elif choice == '4':  # Process records from txt file
             # Prompt user to enter file path; if left empty, use the default file
             file_path = input(
                 f"Enter the txt file path (default: {DEFAULT_INPUT_FILE}): "
             ).strip() or DEFAULT_INPUT_FILE
-            file_reader = FileReader(file_path)  # Create FileReader with the given file path
+            file_reader = FileReader(file_path, pipeline=pipeline)  # Create FileReader that uses the session pipeline
             file_reader.process_file()  # Process the file
 
         elif choice == '5':  # Process records from json file
             file_path = input(
                 f"Enter the json file path (default: {DEFAULT_INPUT_JSON}): "
             ).strip() or DEFAULT_INPUT_JSON
-            file_reader = JsonReader(file_path)  # Create JsonReader with the given file path
+            file_reader = JsonReader(file_path, pipeline=pipeline)  # Create JsonReader that uses the session pipeline
             file_reader.process_json()  # Process the file
 
         elif choice == '6':  # Process records from xml file
             file_path = input(
                 f"Enter the xml file path (default: {DEFAULT_INPUT_XML}): "
             ).strip() or DEFAULT_INPUT_XML
-            file_reader = XMLReader(file_path)  # Create XMLReader with the given file path
+            file_reader = XMLReader(file_path, pipeline=pipeline)  # Create XMLReader that uses the session pipeline
             file_reader.process_xml()  # Process the file
 
-        elif choice == '7':
+        elif choice == '7':  # Process all txt, json and xml files from a folder in parallel
+            source = input("Enter the folder path or glob pattern: ").strip() or '.'
+            ingest_files(source, pipeline=pipeline)
+
+        elif choice == '8':
             print("Exiting...")
-            Record.finalize_and_update_csvs()
             break  # Exit the loop
 
         else:
@@ -499,9 +1465,126 @@ def main():
     for record in records:
         print(record.strip())
 
-    # Close the database connection when done
+    # Close the pipeline, which updates the CSVs, then the database connection and the news feed
+    pipeline.close()
     db_saver.close()
+    Record.feed_writer.close()
+
+
+def parse_args(argv=None):
+    """Parse the command line of the non-interactive mode."""
+    parser = argparse.ArgumentParser(description="Publish news feed records.")
+    subparsers = parser.add_subparsers(dest='command')
+
+    ingest = subparsers.add_parser('ingest', help="process input files without the interactive menu")
+    ingest.add_argument('--txt', action='append', default=[], help="txt file with '---' separated records")
+    ingest.add_argument('--json', action='append', default=[], help="json or json lines file")
+    ingest.add_argument('--xml', action='append', default=[], help="xml file")
+    ingest.add_argument('--dir', action='append', default=[], help="folder or glob of input files, read in parallel")
+    ingest.add_argument('--db', default='records.db', help="database file (default: records.db)")
+    ingest.add_argument('--no-db', action='store_true', help="do not save records to the database")
+    ingest.add_argument('--db-profile', choices=list(DATABASE_PROFILES), default=DEFAULT_DATABASE_PROFILE,
+                        help=f"SQLite settings (default: {DEFAULT_DATABASE_PROFILE})")
+    ingest.add_argument('--feed', default=FILE_NAME, help=f"news feed file (default: {FILE_NAME})")
+    ingest.add_argument('--no-feed', action='store_true', help="do not write records to the news feed")
+    ingest.add_argument('--no-stats', action='store_true', help="do not count words and letters or update the CSVs")
+    ingest.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="records per transaction")
+    ingest.add_argument('--workers', type=int, default=None, help="worker processes for --dir")
+    ingest.add_argument('--quiet', action='store_true', help="print only the final report")
+
+    serve = subparsers.add_parser('serve', help="ingest files with the asyncio service")
+    serve.add_argument('source', help="folder or glob of input files")
+    serve.add_argument('--db', default='records.db', help="database file (default: records.db)")
+    serve.add_argument('--db-profile', choices=list(DATABASE_PROFILES), default=DEFAULT_DATABASE_PROFILE,
+                       help=f"SQLite settings (default: {DEFAULT_DATABASE_PROFILE})")
+    serve.add_argument('--watch', action='store_true', help="keep reading new files that appear in the folder")
+    serve.add_argument('--interval', type=float, default=WATCH_INTERVAL, help="seconds between folder scans")
+    return parser.parse_args(argv)
+
+
+def print_timings(timings, record_count):
+    """Print the seconds and records per second of each ingest stage."""
+    print(f"{'Stage':<12} {'Seconds':>10} {'Records/sec':>14}")
+    for stage, seconds in timings.items():
+        rate = f"{record_count / seconds:,.0f}" if seconds > 0 else "-"
+        print(f"{stage:<12} {seconds:>10.3f} {rate:>14}")
+    print(f"Records processed: {record_count}")
+
+
+def run_ingest(args):
+    """Run the readers for the files given on the command line and return the exit status."""
+    Record.feed_writer = FeedWriter(args.feed, flush_every=None)
+    db_saver = None if args.no_db else DatabaseSaver(args.db, batch_size=args.batch_size, profile=args.db_profile)
+    inputs = [(path, FileReader) for path in args.txt] + \
+             [(path, JsonReader) for path in args.json] + \
+             [(path, XMLReader) for path in args.xml]
+
+    timings = {}
+    failed = 0
+    started = time.perf_counter()
+    with open(os.devnull, 'w') if args.quiet else nullcontext(sys.stdout) as output, redirect_stdout(output):
+        with build_pipeline(db_saver, feed=not args.no_feed, update_csvs=True, batch_size=args.batch_size,
+                            timings=timings, statistics=not args.no_stats) as pipeline:
+            for file_path, reader_class in inputs:
+                if not os.path.exists(file_path):
+                    print(f"File '{file_path}' does not exist.")
+                    failed += 1
+                    continue
+                accepted_before = pipeline.count
+                try:
+                    pipeline.run(reader_class(file_path).read_records())
+                except sqlite3.Error:
+                    raise  # The database cannot take the other inputs either
+                except Exception as error:  # Invalid records, json or xml; the other inputs are still read
+                    print(f"Failed to process '{file_path}': {error}")
+                    partial = pipeline.count - accepted_before
+                    if partial:
+                        pipeline.flush()  # Records read before the error are published like the others
+                        print(f"{partial} record(s) of '{file_path}' were published before the error.")
+                    failed += 1
+                    continue
+                pipeline.flush()  # Make sure all records are saved before the input file is removed
+                os.remove(file_path)  # Remove file after successful processing
+                print(f"File '{file_path}' processed and removed.")
+
+            for source in args.dir:
+                _, failed_files, _ = ingest_files(
+                    source, max_workers=args.workers, pipeline=pipeline)
+                failed += failed_files
+    record_count = pipeline.count  # Every accepted record was written, including those of failed inputs
+    Record.feed_writer.close()
+    if db_saver:
+        db_saver.close()
+
+    # Reading covers parsing and normalization: everything that is not done by a sink
+    timings['total'] = time.perf_counter() - started
+    timings['read'] = timings['total'] - sum(timings.get(stage, 0.0) for stage in ('feed', 'statistics', 'database'))
+    print_timings({stage: timings[stage] for stage in ('read', 'feed', 'statistics', 'database', 'total')
+                   if stage in timings}, record_count)
+    if failed:
+        print(f"{failed} input(s) failed.")
+        return 1
+    return 0
+
+
+def cli(argv=None):
+    """Run the interactive menu, or the ingest command when one is given on the command line."""
+    args = parse_args(argv)
+    if args.command == 'ingest':
+        return run_ingest(args)
+    if args.command == 'serve':
+        service = IngestService(args.db, profile=args.db_profile)  # Kept here for its counts after an interrupt
+        try:
+            asyncio.run(run_service(args.source, watch=args.watch, interval=args.interval, service=service))
+        except KeyboardInterrupt:
+            print("Service stopped.")
+        except Exception as error:
+            print(f"Service failed: {error}")
+            return 1
+        return 1 if service.failed else 0
+    main()
+    return 0
 
 
 if __name__ == "__main__":
-    main()   # Run the main function
+    sys.exit(cli())   # Run the menu or the ingest command
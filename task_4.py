@@ -2,6 +2,7 @@
 import random
 import string
 from collections import defaultdict
+from functools import lru_cache
 import re
 
 
@@ -57,15 +58,13 @@ def create_common_dict(dict_list):
     return final_dict
 
 
-# Generate a list of random number of dictionaries
-list_of_dict = generate_random_dicts()
-print(f"Generated List of Dictionaries: {list_of_dict}")
-
-# Create a common dictionary from a list of dictionaries
-print(f"Common Dictionary: {create_common_dict(list_of_dict)}")
+# Functions for task 3
+# Number of distinct short fields (cities, nicknames) kept by normalize_field
+FIELD_CACHE_SIZE = 4096
+# Misspelled "iz" between whitespace characters
+MISSPELLING_PATTERN = re.compile(r'(?<=\s)iz(?=\s)')
 
 
-# Functions for task 3
 def number_of_whitespace_characters(text):
     """Count number of whitespace character in text"""
 
@@ -100,26 +99,35 @@ def text_normalize(text):
     """Normalize the text: handle case normalization and fix extra spaces."""
 
     if isinstance(text, str):
-        # Replace newline characters with spaces and adjust spacing around quotes
-        text_normal = text.replace('\n', ' ').replace('“', ' “')
-
-        # Remove extra whitespace and lowercase everything
-        text_normal = ' '.join(text_normal.split()).lower()
+        # Adjust spacing around quotes and remove extra whitespace, newlines included
+        text_normal = ' '.join(text.replace('“', ' “').split())
 
-        # Split sentences by period followed by a space
-        sentences_split = text_normal.split('. ')
+        # A single sentence only needs its first letter capitalized and the rest lowercased
+        if '. ' not in text_normal:
+            return text_normal.capitalize()
 
-        # Capitalize the first word of each sentence
-        sentences = [sentence.strip().capitalize() for sentence in sentences_split]
-
-        # Join the sentences back together
-        text_normal = '. '.join(sentences)
-
-        return text_normal
+        # Split sentences by period followed by a space, capitalize each one and join them back together
+        return '. '.join([sentence.strip().capitalize() for sentence in text_normal.split('. ')])
     else:
         print("Input is not a valid string.")
         return None
 
+
+def normalize_many(texts):
+    """Normalize an iterable of texts and return the results as a list."""
+    normalize = text_normalize  # Local name avoids a global lookup per text
+    return [normalize(text) for text in texts]
+
+
+@lru_cache(maxsize=FIELD_CACHE_SIZE)
+def normalize_field(text):
+    """Normalize a short, often repeated field such as a city or nickname, caching the results.
+
+    Hit and miss counters are available through normalize_field.cache_info().
+    """
+    return text_normalize(text)
+
+
 def new_text_with_sentence(text):
     text_with_sentence = text_normalize(text) + create_new_sentence(text)
     return text_with_sentence
@@ -132,10 +140,11 @@ def fix_misspelling(text):
     normalized_text = text_normalize(text)
 
     # Fix “is” surrounded by spaces or placed in start or end of sentence
-    result = re.sub(r'(?<=\s)iz(?=\s)', 'is', text_normalize(text))
+    result = MISSPELLING_PATTERN.sub('is', normalized_text)
 
     return result
 
+
 text = """
  tHis iz your homeWork, copy these Text to variable.
 
@@ -152,13 +161,22 @@ text = """
  last iz TO calculate nuMber OF Whitespace characteRS in this Tex. caREFULL, not only Spaces, but ALL whitespaces.
 """
 
-# Calculate number of whitespace characters
-number_of_whitespace_characters(text)
-# Create new sentence
-print(create_new_sentence(text))
-# Text normalize
-print(text_normalize(text))
-# Text normalize and add new sentence to text
-print(new_text_with_sentence(text))
-# Fix iz to is
-print(fix_misspelling(text))
+
+if __name__ == "__main__":
+    # Generate a list of random number of dictionaries
+    list_of_dict = generate_random_dicts()
+    print(f"Generated List of Dictionaries: {list_of_dict}")
+
+    # Create a common dictionary from a list of dictionaries
+    print(f"Common Dictionary: {create_common_dict(list_of_dict)}")
+
+    # Calculate number of whitespace characters
+    number_of_whitespace_characters(text)
+    # Create new sentence
+    print(create_new_sentence(text))
+    # Text normalize
+    print(text_normalize(text))
+    # Text normalize and add new sentence to text
+    print(new_text_with_sentence(text))
+    # Fix iz to is
+    print(fix_misspelling(text))
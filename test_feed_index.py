@@ -0,0 +1,61 @@
+# Tests of the feed index against the repo's own news feed, which mixes the old and current formats
+import os
+import shutil
+from datetime import datetime
+
+import pytest
+
+from feed_index import FeedIndex
+from task_10 import News
+
+FEED = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'news_feed.txt')
+
+
+@pytest.fixture
+def feed_path(tmp_path):
+    path = str(tmp_path / 'news_feed.txt')
+    shutil.copy(FEED, path)
+    return path
+
+
+def test_every_record_is_indexed(feed_path):
+    with open(FEED, encoding='utf-8') as file:
+        headers = [line for line in file.read().split('\n')
+                   if line in ('News', 'Private Ad') or line.startswith('Nickname:')]
+    with FeedIndex(feed_path) as index:
+        assert len(index) == len(headers)
+        assert [index.get(number).format().split('\n', 1)[0] for number in range(len(index))] == headers
+
+
+def test_record_without_blank_line_is_split(feed_path):
+    # The Minsk News record is directly followed by the Washington one
+    with FeedIndex(feed_path) as index:
+        news = list(index.scan(datetime(2025, 3, 25, 23, 35), datetime(2025, 4, 2, 22, 42, 12), News))
+        assert [record.city for record in news] == ['Minsk', 'Washington']
+        assert news[0].text == 'AI-driven phishing scams exploded last year. The trend continues in 2025'
+        assert news[1].text == 'New photos from mars show nasa rover has holes in its wheels.'
+        assert news[1].date == '2025-04-02 22:42:12'
+
+
+def test_index_file_is_reused(feed_path):
+    with FeedIndex(feed_path) as index:
+        records = [index.get(number).format() for number in range(len(index))]
+    with FeedIndex(feed_path) as index:
+        assert index.update() == 0
+        assert [index.get(number).format() for number in range(len(index))] == records
+
+
+def test_replaced_feed_is_reindexed(feed_path):
+    with FeedIndex(feed_path) as index:
+        count = len(index)
+    with open(feed_path, encoding='utf-8') as file:
+        old_feed = file.read()
+    comments = ''.join(f"Nickname: New{number}\nDate: 2026-01-0{number} 10:00:00\nHi there\nWords count: 2\n\n"
+                       for number in range(1, 4))
+    with open(feed_path, 'w', encoding='utf-8', newline='\n') as file:
+        file.write(comments + old_feed)  # Longer than the indexed feed, so only its content shows the change
+    with FeedIndex(feed_path) as index:
+        assert len(index) == count + 3
+        assert index.get(0).nickname == 'New1'
+        assert index.get(3).format() == 'News\nDate: 2025-03-23 20:50:52\nCity: Gdansk\n' \
+            'AI-driven phishing scams exploded last year. The trend continues in 2025\n\n'
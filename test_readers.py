@@ -0,0 +1,63 @@
+# Regression tests for the streaming readers: every buffer size must give the same records
+import io
+import json
+
+import pytest
+
+from task_10 import JsonStreamParser, iter_record_blocks
+
+TEXT_SAMPLES = [
+    "",
+    "---",
+    "News\nLondon\nSomething happened",
+    "News\nLondon\nSomething happened\n---\nPrivateAd\nSelling a bike\n2030-01-01\n",
+    "---\nfirst\n------second--\n-\n---\n\n---  \n---third - -- ---",
+    "Comment\nанна\nПривет, мир — 😀\n---\nNews\nМинск\nТекст",
+]
+
+JSON_SAMPLES = [
+    '{}',
+    '{"News": []}',
+    ' \n{ "News" : [ ] , "Comment" : [ ] }\n ',
+    '{"News": [{"text": "Something happened", "city": "London"}]}',
+    '{"News": [{"text": "a \\"quoted\\" {brace} [bracket], comma", "city": "L"}, {"text": "", "city": "}"}],'
+    ' "PrivateAd": [{"text": "bike", "expiration_date": "2030-01-01", "extra": {"n": [1, 2.5, -3e2, null]}}],'
+    ' "Comment": [{"nickname": "анна", "text": "Привет — 😀 \\u00e9\\n"}]}',
+    '{"Comment": [12345, true, false, null, "x"], "News": {"text": "a single record", "city": "Paris"}}',
+    '{"A": [1.5, 2]}',
+    '{"A": [1e5]}',
+    '{"A": [-3]}',
+    '{"A": [-0.25E-3 , 1234567890123 ], "B": 6.5}',
+]
+
+
+def expected_blocks(text):
+    return [block.strip() for block in text.split('---') if block.strip()]
+
+
+def expected_records(text):
+    records = []
+    for record_type, value in json.loads(text).items():
+        records.extend((record_type, record) for record in (value if isinstance(value, list) else [value]))
+    return records
+
+
+@pytest.mark.parametrize('text', TEXT_SAMPLES)
+def test_record_blocks_for_every_buffer_size(text):
+    for buffer_size in range(1, len(text) + 2):
+        assert list(iter_record_blocks(io.StringIO(text), buffer_size=buffer_size)) == expected_blocks(text), \
+            f"buffer_size={buffer_size}"
+
+
+@pytest.mark.parametrize('text', JSON_SAMPLES)
+def test_json_stream_for_every_buffer_size(text):
+    for buffer_size in range(1, len(text) + 2):
+        assert list(JsonStreamParser(io.StringIO(text), buffer_size)) == expected_records(text), \
+            f"buffer_size={buffer_size}"
+
+
+@pytest.mark.parametrize('text', ['', '{"News": [{"text": "cut"}', '{"News": [1, 2', '{"News" [1]}', '[]'])
+def test_json_stream_rejects_broken_json(text):
+    for buffer_size in (1, 2, 7, 4096):
+        with pytest.raises(ValueError):
+            list(JsonStreamParser(io.StringIO(text), buffer_size))
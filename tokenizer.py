@@ -0,0 +1,17 @@
+# Word tokenizer shared by the text statistics and the comment word count
+import re
+
+# A word is a whitespace-separated token with at least one letter or digit, trimmed to run
+# from its first to its last letter or digit, e.g. '"don't!"' -> "don't"; '—' and '_' are not words
+WORD_PATTERN = re.compile(r'[^\W_](?:\S*[^\W_])?')
+
+
+def iter_words(text):
+    """Yield the lowercase words of a text one at a time, without copying the whole text."""
+    for match in WORD_PATTERN.finditer(text):
+        yield match.group().lower()
+
+
+def count_words(text):
+    """Count the words in a text, using the same definition of a word as iter_words."""
+    return sum(1 for _ in WORD_PATTERN.finditer(text))